@@ -1,5 +1,8 @@
+from media_dl.downloader.aio import AsyncMediaDownloader  # noqa: F401
 from media_dl.downloader.main import MediaDownloader  # noqa: F401
 from media_dl.exceptions import DownloadError, ExtractError  # noqa: F401
+from media_dl.metrics import Metrics  # noqa: F401
 from media_dl.models.content.list import LazyPlaylist, Playlist, Search  # noqa: F401
 from media_dl.models.content.media import LazyMedia, Media  # noqa: F401
 from media_dl.models.format.types import AudioFormat, VideoFormat  # noqa: F401
+from media_dl.retry import RetryPolicy  # noqa: F401
@@ -1,27 +1,385 @@
+"""Extraction cache backends."""
+
 import hashlib
+import os
+import sqlite3
+import threading
 import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Generic, Literal, TypeVar
 
 from media_dl.path import CACHE_DIR
 
 EXPIRATION = 24 * 60 * 60
+MAX_ENTRIES = 10_000
+MAX_MODELS = 512
 
+CACHE_BACKEND = Literal["sqlite", "file"]
 
-def load_info(url: str) -> str | None:
-    file = CACHE_DIR / _url_hash(url)
 
-    if file.exists():
-        age = time.time() - file.stat().st_mtime
-        if age < EXPIRATION:
-            return file.read_text()
+@dataclass(slots=True)
+class CacheStats:
+    entries: int
+    expired: int
+    size: int
+
+
+@dataclass(slots=True)
+class MemoryCacheStats:
+    entries: int
+    hits: int
+    misses: int
+
+
+class CacheBackend(ABC):
+    """Key-value store for serialized extraction results.
+
+    Args:
+        expiration: Seconds before an entry is considered stale.
+        max_entries: Maximum entries to keep. Least recently used are evicted first.
+    """
+
+    def __init__(
+        self,
+        expiration: float = EXPIRATION,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        self.expiration = expiration
+        self.max_entries = max_entries
+
+    @abstractmethod
+    def load(self, key: str) -> str | None: ...
+
+    @abstractmethod
+    def save(self, key: str, content: str) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> CacheStats: ...
+
+    @abstractmethod
+    def prune(self, all: bool = False) -> int:
+        """Remove expired and least recently used entries.
+
+        Args:
+            all: Remove every entry.
+
+        Returns:
+            Number of removed entries.
+        """
+
+
+class SQLiteCache(CacheBackend):
+    """Single-file indexed cache."""
+
+    def __init__(
+        self,
+        filepath: Path = CACHE_DIR / "cache.db",
+        expiration: float = EXPIRATION,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        super().__init__(expiration, max_entries)
+
+        self.filepath = filepath
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            filepath,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, "
+                "content TEXT NOT NULL, "
+                "created REAL NOT NULL, "
+                "accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+
+    def load(self, key: str) -> str | None:
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, created FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if not row:
+                return None
+
+            content, created = row
+
+            if now - created >= self.expiration:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+
+            self._conn.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?",
+                (now, key),
+            )
+
+        return content
+
+    def save(self, key: str, content: str) -> None:
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (key, content, now, now),
+            )
+            self._evict()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            entries, expired, size = self._conn.execute(
+                "SELECT COUNT(*), "
+                "COALESCE(SUM(created < ?), 0), "
+                "COALESCE(SUM(LENGTH(content)), 0) "
+                "FROM entries",
+                (time.time() - self.expiration,),
+            ).fetchone()
+
+        return CacheStats(entries=entries, expired=expired, size=size)
+
+    def prune(self, all: bool = False) -> int:
+        with self._lock:
+            if all:
+                cursor = self._conn.execute("DELETE FROM entries")
+                return cursor.rowcount
+
+            cursor = self._conn.execute(
+                "DELETE FROM entries WHERE created < ?",
+                (time.time() - self.expiration,),
+            )
+            return cursor.rowcount + self._evict()
+
+    def _evict(self) -> int:
+        cursor = self._conn.execute(
+            "DELETE FROM entries WHERE key IN "
+            "(SELECT key FROM entries ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        return cursor.rowcount
+
+
+class FileCache(CacheBackend):
+    """One JSON file per entry inside a directory.
+
+    Modification time tracks when an entry was saved and access time when it
+    was last loaded, to evict the least recently used.
+    """
+
+    def __init__(
+        self,
+        directory: Path = CACHE_DIR,
+        expiration: float = EXPIRATION,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        super().__init__(expiration, max_entries)
+        self.directory = directory
+
+        self._entries: int | None = None
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> str | None:
+        file = self.directory / _key_hash(key)
+
+        try:
+            stat = file.stat()
+            now = time.time()
+
+            if now - stat.st_mtime < self.expiration:
+                content = file.read_text()
+                os.utime(file, (now, stat.st_mtime))
+                return content
+        except FileNotFoundError:
+            pass
+
+        return None
+
+    def save(self, key: str, content: str) -> None:
+        file = self.directory / _key_hash(key)
+        new = not file.exists()
+
+        # Write to a sibling file then swap, so readers never see partial data.
+        temp = file.with_name(f"{file.name}.{threading.get_ident()}.tmp")
+        temp.write_text(content)
+        os.replace(temp, file)
+
+        if not new:
+            return
 
-    return None
+        with self._lock:
+            if self._entries is None:
+                self._entries = len(self._files())
+            else:
+                self._entries += 1
+
+            if self._entries > self.max_entries:
+                self._remove()
+
+    def stats(self) -> CacheStats:
+        limit = time.time() - self.expiration
+        files = [stat for _, stat in self._files()]
+
+        return CacheStats(
+            entries=len(files),
+            expired=sum(1 for s in files if s.st_mtime < limit),
+            size=sum(s.st_size for s in files),
+        )
+
+    def prune(self, all: bool = False) -> int:
+        with self._lock:
+            return self._remove(all)
+
+    def _remove(self, all: bool = False) -> int:
+        limit = time.time() - self.expiration
+        files = sorted(
+            self._files(),
+            key=lambda item: max(item[1].st_atime, item[1].st_mtime),
+            reverse=True,
+        )
+
+        removed = 0
+
+        for index, (file, stat) in enumerate(files):
+            if all or index >= self.max_entries or stat.st_mtime < limit:
+                file.unlink(missing_ok=True)
+                removed += 1
+
+        self._entries = len(files) - removed
+        return removed
+
+    def _files(self) -> list[tuple[Path, os.stat_result]]:
+        files = []
+
+        for file in self.directory.glob("*.json"):
+            try:
+                files.append((file, file.stat()))
+            except FileNotFoundError:
+                continue
+
+        return files
+
+
+V = TypeVar("V")
+
+
+class MemoryCache(Generic[V]):
+    """Thread-safe in-process LRU with hit/miss counters.
+
+    Args:
+        maxsize: Maximum entries to keep. Least recently used are evicted first.
+        expiration: Seconds before an entry is considered stale.
+    """
+
+    def __init__(self, maxsize: int = MAX_MODELS, expiration: float = EXPIRATION):
+        self.maxsize = maxsize
+        self.expiration = expiration
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._items: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: Hashable) -> V | None:
+        with self._lock:
+            item = self._items.get(key)
+
+            if item and time.time() - item[0] < self.expiration:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[1]
+
+            if item:
+                del self._items[key]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._items[key] = (time.time(), value)
+            self._items.move_to_end(key)
+
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> MemoryCacheStats:
+        with self._lock:
+            return MemoryCacheStats(
+                entries=len(self._items),
+                hits=self.hits,
+                misses=self.misses,
+            )
+
+
+MODELS: MemoryCache[Any] = MemoryCache()
+"""Already validated models, keyed by model class and URL."""
+
+BACKENDS: dict[CACHE_BACKEND, type[CacheBackend]] = {
+    "sqlite": SQLiteCache,
+    "file": FileCache,
+}
+
+_backend: CacheBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> CacheBackend:
+    """Get current cache backend. By default, `SQLiteCache` is used."""
+
+    global _backend
+
+    with _backend_lock:
+        if not _backend:
+            _backend = SQLiteCache()
+
+        return _backend
+
+
+def set_backend(backend: CacheBackend | CACHE_BACKEND) -> CacheBackend:
+    """Change the cache backend used by extractions.
+
+    Args:
+        backend: Backend instance or name of a builtin backend.
+    """
+
+    global _backend
+
+    if isinstance(backend, str):
+        backend = BACKENDS[backend]()
+
+    with _backend_lock:
+        _backend = backend
+
+    return backend
+
+
+def load_info(url: str) -> str | None:
+    return get_backend().load(url)
 
 
 def save_info(url: str, content: str):
-    file = CACHE_DIR / _url_hash(url)
-    file.write_text(content)
+    get_backend().save(url, content)
 
 
-def _url_hash(url: str) -> str:
-    hash = hashlib.sha256(url.encode()).hexdigest()
+def _key_hash(key: str) -> str:
+    hash = hashlib.sha256(key.encode()).hexdigest()
     return f"{hash}.json"
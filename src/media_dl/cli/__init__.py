@@ -1,6 +1,6 @@
 from typer import Typer
 
-from media_dl.cli.commands import download, main
+from media_dl.cli.commands import cache, download, main
 from media_dl.types import APPNAME
 
 app = Typer(
@@ -9,6 +9,7 @@ app = Typer(
     rich_markup_mode="rich",
 )
 app.add_typer(download.app)
+app.add_typer(cache.app)
 
 
 def run():
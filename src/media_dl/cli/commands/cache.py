@@ -0,0 +1,53 @@
+from typing import Annotated
+
+from loguru import logger
+from typer import Option, Typer
+
+from media_dl.cache import CACHE_BACKEND
+
+app = Typer(
+    name="cache",
+    help="Inspect and clean the extraction cache.",
+    no_args_is_help=True,
+)
+
+BackendOption = Annotated[
+    CACHE_BACKEND,
+    Option(
+        "--backend",
+        help="Cache storage to operate.",
+    ),
+]
+
+
+@app.command()
+def stats(backend: BackendOption = "sqlite"):
+    """Show cache usage."""
+
+    from media_dl.cache import set_backend
+
+    result = set_backend(backend).stats()
+
+    logger.info("📦 Entries: {entries}", entries=result.entries)
+    logger.info("⌛ Expired: {expired}", expired=result.expired)
+    logger.info("💾 Size: {size:.2f} MB", size=result.size / 1024**2)
+
+
+@app.command()
+def prune(
+    backend: BackendOption = "sqlite",
+    all: Annotated[
+        bool,
+        Option(
+            "--all",
+            help="Remove every entry, not only the expired ones.",
+        ),
+    ] = False,
+):
+    """Remove expired and least recently used entries."""
+
+    from media_dl.cache import set_backend
+
+    removed = set_backend(backend).prune(all)
+
+    logger.info("🧹 {removed} entries removed.", removed=removed)
@@ -5,11 +5,13 @@ from typing import Annotated
 from loguru import logger
 from typer import Argument, BadParameter, Option, Typer
 
+from media_dl.cache import CACHE_BACKEND
 from media_dl.cli.completions import (
     complete_output,
     complete_query,
     complete_resolution,
     parse_queries,
+    parse_rate,
 )
 from media_dl.cli.config import CONFIG
 from media_dl.cli.rich import Status
@@ -93,6 +95,119 @@ What format you want request?
             rich_help_panel=HelpPanel.downloader,
         ),
     ] = 5,
+    concurrent_fragments: Annotated[
+        int,
+        Option(
+            "--concurrent-fragments",
+            "-N",
+            help="Fragments to download at the same time for HLS/DASH formats.",
+            rich_help_panel=HelpPanel.downloader,
+            min=1,
+        ),
+    ] = 1,
+    connections_per_file: Annotated[
+        int,
+        Option(
+            "--connections-per-file",
+            help="Connections to download large HTTP formats in byte ranges.",
+            rich_help_panel=HelpPanel.downloader,
+            min=1,
+        ),
+    ] = 1,
+    resolve_workers: Annotated[
+        int | None,
+        Option(
+            "--resolve-workers",
+            help="Limit of simultaneous extractions. Defaults to --threads.",
+            rich_help_panel=HelpPanel.downloader,
+            show_default=False,
+            min=1,
+        ),
+    ] = None,
+    download_workers: Annotated[
+        int | None,
+        Option(
+            "--download-workers",
+            help="Limit of simultaneous transfers. Defaults to --threads.",
+            rich_help_panel=HelpPanel.downloader,
+            show_default=False,
+            min=1,
+        ),
+    ] = None,
+    process_workers: Annotated[
+        int | None,
+        Option(
+            "--process-workers",
+            help="Limit of simultaneous FFmpeg jobs. Defaults to --threads.",
+            rich_help_panel=HelpPanel.downloader,
+            show_default=False,
+            min=1,
+        ),
+    ] = None,
+    resume: Annotated[
+        bool,
+        Option(
+            help="Resume interrupted downloads and skip completed ones. "
+            "Keeps a .media-dl folder in the output directory.",
+            rich_help_panel=HelpPanel.downloader,
+        ),
+    ] = False,
+    limit_rate: Annotated[
+        float | None,
+        Option(
+            "--limit-rate",
+            help="Maximum download speed of all transfers, like 500K or 4.2M.",
+            rich_help_panel=HelpPanel.downloader,
+            show_default=False,
+            parser=parse_rate,
+            metavar="RATE",
+        ),
+    ] = None,
+    host_connections: Annotated[
+        int | None,
+        Option(
+            "--host-connections",
+            help="Limit of simultaneous transfers to the same host.",
+            rich_help_panel=HelpPanel.downloader,
+            show_default=False,
+            min=1,
+        ),
+    ] = None,
+    retries: Annotated[
+        int,
+        Option(
+            "--retries",
+            help="Maximum tries of each download on transient errors.",
+            rich_help_panel=HelpPanel.downloader,
+            min=1,
+        ),
+    ] = 3,
+    linger: Annotated[
+        bool,
+        Option(
+            help="Keep finished downloads visible for a moment.",
+            rich_help_panel=HelpPanel.downloader,
+        ),
+    ] = True,
+    stats: Annotated[
+        bool,
+        Option(
+            "--stats",
+            help="Show time spent in each stage after downloads.",
+            rich_help_panel=HelpPanel.downloader,
+        ),
+    ] = False,
+    archive: Annotated[
+        Path | None,
+        Option(
+            "--archive",
+            help="File to record downloads and skip them without extraction.",
+            rich_help_panel=HelpPanel.downloader,
+            show_default=False,
+            file_okay=True,
+            dir_okay=False,
+        ),
+    ] = None,
     ffmpeg_path: Annotated[
         Path | None,
         Option(
@@ -103,6 +218,14 @@ What format you want request?
             dir_okay=False,
         ),
     ] = None,
+    cache_backend: Annotated[
+        CACHE_BACKEND,
+        Option(
+            "--cache-backend",
+            help="Cache storage of extractions.",
+            rich_help_panel=HelpPanel.downloader,
+        ),
+    ] = "sqlite",
     cache: Annotated[
         bool,
         Option(
@@ -121,9 +244,15 @@ What format you want request?
             ExtractError,
             Media,
             MediaDownloader,
+            Metrics,
             Playlist,
+            RetryPolicy,
             Search,
         )
+        from media_dl.cache import set_backend
+        from media_dl.downloader.states.progress import ProgressCallback
+
+        set_backend(cache_backend)
 
     # Initialize Downloader
     try:
@@ -132,8 +261,19 @@ What format you want request?
             quality=quality,
             output=output,
             threads=threads,
+            concurrent_fragments=concurrent_fragments,
+            connections_per_file=connections_per_file,
             use_cache=cache,
             ffmpeg_path=ffmpeg_path,
+            resolve_workers=resolve_workers,
+            download_workers=download_workers,
+            process_workers=process_workers,
+            resume=resume,
+            archive=archive,
+            limit_rate=limit_rate,
+            host_connections=host_connections,
+            retry=RetryPolicy(attempts=retries),
+            metrics=Metrics() if stats else None,
         )
     except FileNotFoundError as err:
         raise BadParameter(str(err))
@@ -169,9 +309,15 @@ What format you want request?
             if CONFIG.quiet:
                 downloader.download_all(result, None)
             else:
-                downloader.download_all(result)
+                downloader.download_all(result, ProgressCallback(linger=linger))
 
             logger.info("✅ Download Finished.")
+
+            if downloader.metrics:
+                logger.info(
+                    "📊 Stats:\n{summary}", summary=downloader.metrics.summary()
+                )
+                downloader.metrics.reset()
         except (ExtractError, DownloadError) as err:
             logger.error("❌ {error}", error=str(err))
         finally:
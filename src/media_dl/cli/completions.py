@@ -51,3 +51,14 @@ def parse_queries(
             raise BadParameter(f"'{selection}' is invalid. {msg}")
 
         yield target, entry
+
+
+def parse_rate(value: str) -> float:
+    """Parse a rate like `500K` or `4.2M` to bytes per second."""
+
+    from yt_dlp.utils import parse_bytes
+
+    if (rate := parse_bytes(value)) is None or rate <= 0:
+        raise BadParameter(f"'{value}' is invalid. Should be like 500K or 4.2M.")
+
+    return rate
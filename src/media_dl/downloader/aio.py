@@ -0,0 +1,196 @@
+import asyncio
+import concurrent.futures as cf
+from collections.abc import AsyncIterator, Callable, Iterable, Sized
+from functools import partial
+from pathlib import Path
+from typing import Any, TypeVar, get_args
+
+from loguru import logger
+
+from media_dl.downloader.index import OutputIndex
+from media_dl.downloader.main import QUEUE_FACTOR, MediaDownloader, MediaResult
+from media_dl.downloader.stages import STAGE
+from media_dl.exceptions import DownloadError
+from media_dl.models.content.list import LazyPlaylist
+from media_dl.models.content.media import LazyMedia
+from media_dl.models.progress.media import MediaDownloadCallback, MediaDownloadState
+
+T = TypeVar("T")
+
+
+class AsyncMediaDownloader:
+    """Asyncio interface of `MediaDownloader`.
+
+    Queued medias are coroutines waiting on a semaphore per stage, only the
+    running ones take a thread of a bounded executor. A single event loop can
+    drive thousands of jobs.
+
+    Args:
+        **options: Same options of `MediaDownloader`.
+
+    Raises:
+        FileNotFoundError: `ffmpeg` path not is a FFmpeg executable.
+    """
+
+    def __init__(self, **options: Any):
+        self.downloader = MediaDownloader(**options)
+
+        workers = self.downloader.workers
+        self._executor = cf.ThreadPoolExecutor(
+            max_workers=sum(workers.values()),
+            thread_name_prefix="media-dl-async",
+        )
+        self._transfers = cf.ThreadPoolExecutor(
+            max_workers=workers["download"] * 2,
+            thread_name_prefix="media-dl-transfer",
+        )
+        self._semaphores = {
+            stage: asyncio.Semaphore(workers[stage]) for stage in get_args(STAGE)
+        }
+        self._index = OutputIndex(persist=self.downloader.resume)
+
+    async def download(
+        self,
+        media: LazyMedia,
+        on_progress: MediaDownloadCallback | None = None,
+        playlist: LazyPlaylist | None = None,
+    ) -> Path | None:
+        """Single download a `Media` result.
+
+        Args:
+            media: Target `Media` to download.
+            on_progress: Callback function to get progress information.
+                It is called from worker threads.
+            playlist: `Playlist` where the media comes from.
+
+        Returns:
+            Path to downloaded file, or `None` if the media was archived
+            without a recorded file.
+        """
+
+        pipeline = self.downloader._pipeline(
+            media, playlist, on_progress, self._index, transfers=self._transfers
+        )
+        plan = await self._run("resolve", pipeline.stage_resolve)
+
+        if plan is None or isinstance(plan, Path):
+            return plan
+
+        plan = await self._run("download", pipeline.stage_download, plan)
+        return await self._run("process", pipeline.stage_process, plan)
+
+    async def download_all(
+        self,
+        data: MediaResult,
+        on_progress: MediaDownloadCallback | None = None,
+    ) -> list[Path]:
+        """Batch download any result.
+
+        Medias are pulled from `data` as jobs finish, keeping a bounded
+        amount of them in flight like `MediaDownloader`.
+
+        Returns:
+            List of paths to downloaded files, in completion order.
+        """
+
+        playlist = data if isinstance(data, LazyPlaylist) else None
+        medias = self.downloader._data_to_list(data)
+        paths: list[Path] = []
+        failed: list[LazyMedia] = []
+
+        async def _download_many(items: Iterable[LazyMedia], final_pass: bool):
+            size = sum(self.downloader.workers.values()) * QUEUE_FACTOR
+            queue: asyncio.Queue[LazyMedia | None] = asyncio.Queue(size)
+
+            async def _produce():
+                async for media in self._iterate(items):
+                    await queue.put(media)
+
+                for _ in range(size):
+                    await queue.put(None)
+
+            async def _consume():
+                while (media := await queue.get()) is not None:
+                    try:
+                        if path := await self.download(media, on_progress, playlist):
+                            paths.append(path)
+                    except (ConnectionError, DownloadError) as e:
+                        logger.error(f"Failed to download: {e}")
+
+                        if getattr(e, "retryable", False) and not final_pass:
+                            failed.append(media)
+
+            tasks = [
+                asyncio.ensure_future(_produce()),
+                *(asyncio.ensure_future(_consume()) for _ in range(size)),
+            ]
+
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        try:
+            await _download_many(medias, final_pass=False)
+
+            # Last chance for transient errors, once everything else is done.
+            if failed and self.downloader.retry.final_pass:
+                logger.info("🔁 Retrying {count} failed medias.", count=len(failed))
+
+                retry, failed[:] = failed.copy(), []
+                await _download_many(retry, final_pass=True)
+        finally:
+            self._index.save()
+
+        return paths
+
+    async def events(self, data: MediaResult) -> AsyncIterator[MediaDownloadState]:
+        """Batch download any result, iterating its progress events.
+
+        Raises:
+            OutputTemplateError: Output template is invalid.
+        """
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[MediaDownloadState | None] = asyncio.Queue()
+
+        def _callback(state: MediaDownloadState):
+            loop.call_soon_threadsafe(queue.put_nowait, state)
+
+        task = asyncio.ensure_future(self.download_all(data, _callback))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            while (state := await queue.get()) is not None:
+                yield state
+
+            await task
+        finally:
+            task.cancel()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._transfers.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    async def _run(self, stage: STAGE, function: Callable[..., T], *args) -> T:
+        async with self._semaphores[stage]:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(function, *args))
+
+    async def _iterate(self, medias: Iterable[LazyMedia]) -> AsyncIterator[LazyMedia]:
+        if isinstance(medias, Sized):
+            for media in medias:
+                yield media
+        else:
+            # Could be a lazy playlist, fetch next pages outside the event loop.
+            items = iter(medias)
+
+            while (media := await asyncio.to_thread(next, items, None)) is not None:
+                yield media
@@ -0,0 +1,71 @@
+import threading
+from pathlib import Path
+
+from media_dl.models.content.media import LazyMedia
+from media_dl.types import StrPath
+
+
+class DownloadArchive:
+    """Record of downloaded medias, to skip them before any extraction.
+
+    Every line holds `extractor id` like the YT-DLP archive, so both can be
+    shared, optionally followed by a tab and the path of the downloaded file.
+
+    Args:
+        filepath: Text file to read and append downloaded medias.
+    """
+
+    def __init__(self, filepath: StrPath):
+        self.filepath = Path(filepath)
+
+        self._lock = threading.Lock()
+        self._entries: dict[str, str | None] | None = None
+
+    @staticmethod
+    def key(media: LazyMedia) -> str:
+        return f"{media.extractor.lower()} {media.id}"
+
+    def __contains__(self, media: LazyMedia) -> bool:
+        return self.key(media) in self._load()
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def get(self, media: LazyMedia) -> Path | None:
+        """Get path of an archived media, if it was recorded."""
+
+        path = self._load().get(self.key(media))
+        return Path(path) if path else None
+
+    def add(self, media: LazyMedia, filepath: Path | None = None) -> None:
+        key = self.key(media)
+        entries = self._load()
+
+        with self._lock:
+            if key in entries:
+                return
+
+            entries[key] = str(filepath) if filepath else None
+            line = f"{key}\t{filepath}" if filepath else key
+
+            self.filepath.parent.mkdir(parents=True, exist_ok=True)
+
+            with self.filepath.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def _load(self) -> dict[str, str | None]:
+        with self._lock:
+            if self._entries is None:
+                self._entries = {}
+
+                try:
+                    with self.filepath.open(encoding="utf-8") as f:
+                        for line in f:
+                            key, _, path = line.rstrip("\n").partition("\t")
+
+                            if key := key.strip():
+                                self._entries[key] = path or None
+                except FileNotFoundError:
+                    pass
+
+            return self._entries
@@ -0,0 +1,115 @@
+import copy
+import threading
+from collections.abc import Callable
+
+from loguru import logger
+
+from media_dl.models.progress.media import MediaDownloadCallback, MediaDownloadState
+
+
+class ProgressBus:
+    """Deliver progress states to subscribers from a dispatcher thread.
+
+    Publishing only queues the state, so download threads never wait for
+    subscribers. Downloading states are coalesced per media, subscribers get
+    the latest one at most `rate` times per second. Other states keep their
+    order and are always delivered.
+
+    Args:
+        rate: Deliveries per second.
+    """
+
+    def __init__(self, rate: float = 10.0):
+        if rate <= 0:
+            raise ValueError("Progress rate must be greater than 0.")
+
+        self.rate = rate
+        self.subscribers: list[MediaDownloadCallback] = []
+
+        self._queue: list[list[MediaDownloadState]] = []
+        self._pending: dict[str, list[MediaDownloadState]] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, callback: MediaDownloadCallback) -> Callable[[], None]:
+        """Add a subscriber.
+
+        Returns:
+            Function to remove the subscriber.
+        """
+
+        self.subscribers.append(callback)
+        return lambda: self.subscribers.remove(callback)
+
+    def publish(self, state: MediaDownloadState) -> None:
+        """Queue a state for subscribers, without waiting for them."""
+
+        with self._condition:
+            if state.status == "downloading":
+                # Same state is updated in place, keep a single queued entry.
+                if slot := self._pending.get(state.id):
+                    slot[0] = state
+                    return
+
+                slot = self._pending[state.id] = [state]
+                self._queue.append(slot)
+            else:
+                # Mutated after publish, like processor stages.
+                self._pending.pop(state.id, None)
+                self._queue.append([copy.copy(state)])
+
+    __call__ = publish
+
+    def start(self) -> None:
+        if self._thread:
+            return
+
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._dispatch,
+            name="media-dl-progress",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Deliver the remaining states and stop the dispatcher."""
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _dispatch(self):
+        interval = 1 / self.rate
+
+        while True:
+            with self._condition:
+                if not self._closed:
+                    self._condition.wait(interval)
+
+                queue, self._queue = self._queue, []
+                self._pending.clear()
+                closed = self._closed
+
+            for (state,) in queue:
+                for callback in list(self.subscribers):
+                    try:
+                        callback(state)
+                    # Subscriber errors must not stop the dispatcher.
+                    except Exception:  # noqa: BLE001
+                        logger.exception("Progress subscriber failed.")
+
+            if closed:
+                break
@@ -24,6 +24,8 @@ class FormatConfig:
         output: Directory where to save files.
         ffmpeg_path: Path to FFmpeg executable. By default, it will get the global installed FFmpeg.
         embed_metadata: Embed title, uploader, thumbnail, subtitles, etc. (FFmpeg)
+        concurrent_fragments: Fragments to download at the same time for HLS/DASH formats.
+        connections_per_file: Connections to download large HTTP formats in byte ranges.
     """
 
     format: FILE_FORMAT
@@ -31,10 +33,17 @@ class FormatConfig:
     output: Path = Path.cwd()
     ffmpeg_path: Path | None = None
     embed_metadata: bool = True
+    concurrent_fragments: int = 1
+    connections_per_file: int = 1
 
     def __post_init__(self):
         self.ffmpeg_path = get_ffmpeg(self.ffmpeg_path)
 
+        if self.concurrent_fragments < 1:
+            raise ValueError("Concurrent fragments must be at least 1.")
+        if self.connections_per_file < 1:
+            raise ValueError("Connections per file must be at least 1.")
+
     @property
     def type(self) -> FORMAT_TYPE:
         """Determine general type.
@@ -67,6 +76,12 @@ class FormatConfig:
             cast(EXTENSION, self.format) if self.format in get_args(EXTENSION) else None
         )
 
+    @property
+    def profile(self) -> str:
+        """Identifier of the options which shape the downloaded file."""
+
+        return f"{self.type}:{self.convert or ''}:{self.quality or ''}:{self.output}"
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dict."""
 
@@ -0,0 +1,115 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+from loguru import logger
+
+from media_dl.downloader.journal import DownloadJournal
+
+INDEX_FILENAME = "index.json"
+
+
+class OutputIndex:
+    """Files of the output directories, mapped as `stem -> extensions`.
+
+    Every directory is scanned once on first lookup and then kept updated with
+    the files moved by the downloader, so duplicate checks are dictionary
+    lookups shared by all worker threads.
+
+    Args:
+        persist: Save the index of each directory in `.media-dl/index.json`.
+            It is reused while the modification time of the directory matches.
+    """
+
+    def __init__(self, persist: bool = False):
+        self.persist = persist
+
+        self._lock = threading.Lock()
+        self._directories: dict[Path, dict[str, set[str]]] = {}
+
+    def extensions(self, path: Path) -> set[str]:
+        """Extensions of the files with the same stem than `path` name."""
+
+        with self._lock:
+            files = self._get_directory(path.parent)
+            return set(files.get(path.name, ()))
+
+    def add(self, filepath: Path) -> None:
+        """Register a new file of a directory."""
+
+        with self._lock:
+            files = self._get_directory(filepath.parent)
+            files.setdefault(filepath.stem, set()).add(filepath.suffix[1:])
+
+    def save(self) -> None:
+        """Persist the index of every scanned directory."""
+
+        if not self.persist:
+            return
+
+        with self._lock:
+            for directory, files in self._directories.items():
+                if directory.is_dir():
+                    self._write(directory, files)
+
+    def _get_directory(self, directory: Path) -> dict[str, set[str]]:
+        directory = directory.absolute()
+
+        if (files := self._directories.get(directory)) is None:
+            files = (self.persist and self._read(directory)) or self._scan(directory)
+            self._directories[directory] = files
+
+        return files
+
+    def _scan(self, directory: Path) -> dict[str, set[str]]:
+        files: dict[str, set[str]] = {}
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        stem, dot, extension = entry.name.rpartition(".")
+
+                        if not dot:
+                            stem, extension = extension, ""
+
+                        files.setdefault(stem, set()).add(extension)
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+
+        logger.debug(
+            'Indexed {count} files of "{directory}".',
+            count=len(files),
+            directory=directory,
+        )
+        return files
+
+    def _read(self, directory: Path) -> dict[str, set[str]] | None:
+        try:
+            data = json.loads(
+                (directory / DownloadJournal.DIRNAME / INDEX_FILENAME).read_text()
+            )
+
+            if data["mtime"] != directory.stat().st_mtime_ns:
+                return None
+
+            return {stem: set(exts) for stem, exts in data["files"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write(self, directory: Path, files: dict[str, set[str]]) -> None:
+        folder = directory / DownloadJournal.DIRNAME
+
+        try:
+            folder.mkdir(exist_ok=True)
+            data = {
+                "mtime": directory.stat().st_mtime_ns,
+                "files": {stem: sorted(exts) for stem, exts in files.items()},
+            }
+
+            temp = folder / f"{INDEX_FILENAME}.tmp"
+            temp.write_text(json.dumps(data))
+            os.replace(temp, folder / INDEX_FILENAME)
+        except OSError as err:
+            logger.debug("Unable to save output index: {error}", error=err)
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Literal
+
+from loguru import logger
+
+from media_dl.models.content.media import LazyMedia
+
+JournalState = Literal[
+    "resolved",
+    "downloading",
+    "downloaded",
+    "processed",
+    "completed",
+]
+
+
+@dataclass(slots=True)
+class JournalEntry:
+    key: str
+    state: JournalState
+    profile: str = ""
+    url: str = ""
+    formats: list[str] = field(default_factory=list)
+    downloaded_bytes: float = 0
+    filepath: str | None = None
+
+
+class DownloadJournal:
+    """Persistent record of the downloads of an output directory.
+
+    Every change is appended as a JSON line, so an interrupted run can be
+    resumed: partial formats are kept with deterministic names and completed
+    medias are skipped without extracting them again.
+
+    Args:
+        directory: Output directory where the journal is stored.
+    """
+
+    DIRNAME = ".media-dl"
+    FILENAME = "journal.jsonl"
+
+    def __init__(self, directory: Path):
+        self.directory = directory / self.DIRNAME
+        self.parts_dir = self.directory / "parts"
+        self.filepath = self.directory / self.FILENAME
+
+        self._lock = threading.Lock()
+        self._entries: dict[str, JournalEntry] = {}
+
+        self.parts_dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def key(media: LazyMedia) -> str:
+        return f"{media.extractor.lower()} {media.id}"
+
+    def get(self, media: LazyMedia) -> JournalEntry | None:
+        with self._lock:
+            return self._entries.get(self.key(media))
+
+    def update(
+        self,
+        media: LazyMedia,
+        state: JournalState,
+        **changes,
+    ) -> JournalEntry:
+        """Register a new state of a media and append it to the journal."""
+
+        key = self.key(media)
+
+        with self._lock:
+            entry = self._entries.get(key) or JournalEntry(key=key, state=state)
+            entry.state = state
+
+            for name, value in changes.items():
+                setattr(entry, name, value)
+
+            self._entries[key] = entry
+
+            with self.filepath.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(entry)) + "\n")
+
+        return entry
+
+    def part_file(self, media: LazyMedia, format_id: str) -> Path:
+        """Deterministic path to download a format, so it can be resumed."""
+
+        hash = hashlib.sha1(f"{self.key(media)} {format_id}".encode()).hexdigest()
+        return self.parts_dir / hash[:16]
+
+    def discard(self, media: LazyMedia) -> None:
+        """Forget a media and delete its partial files."""
+
+        self.clear_parts(media)
+        key = self.key(media)
+
+        with self._lock:
+            if self._entries.pop(key, None) is None:
+                return
+
+            # Removal record, so the entry isn't loaded again.
+            with self.filepath.open("a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "discarded": True}) + "\n")
+
+    def clear_parts(self, media: LazyMedia) -> None:
+        """Delete partial and downloaded format files of a media."""
+
+        entry = self.get(media)
+
+        if not entry:
+            return
+
+        for format_id in entry.formats:
+            part = self.part_file(media, format_id)
+
+            for file in self.parts_dir.glob(f"{part.name}*"):
+                file.unlink(missing_ok=True)
+
+    def _load(self) -> None:
+        if not self.filepath.is_file():
+            return
+
+        names = {f.name for f in fields(JournalEntry)}
+        lines = 0
+
+        with self.filepath.open(encoding="utf-8") as f:
+            for line in f:
+                lines += 1
+
+                try:
+                    data = json.loads(line)
+
+                    if data.get("discarded"):
+                        self._entries.pop(data["key"], None)
+                        continue
+
+                    entry = JournalEntry(**{k: data[k] for k in data if k in names})
+                except (ValueError, TypeError, KeyError, AttributeError):
+                    logger.debug("Ignored invalid journal line: {line}", line=line)
+                    continue
+
+                self._entries[entry.key] = entry
+
+        # Keep only the latest state of every media.
+        if lines > len(self._entries) * 2:
+            temp = self.filepath.with_suffix(".tmp")
+
+            with temp.open("w", encoding="utf-8") as f:
+                for entry in self._entries.values():
+                    f.write(json.dumps(asdict(entry)) + "\n")
+
+            os.replace(temp, self.filepath)
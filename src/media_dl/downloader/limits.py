@@ -0,0 +1,90 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+
+class RateLimiter:
+    """Token bucket shared by all transfers, to limit the total bandwidth.
+
+    Args:
+        rate: Maximum bytes per second. It is also the allowed burst.
+    """
+
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError("Rate limit must be greater than 0.")
+
+        self.rate = rate
+
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: float) -> None:
+        """Register transferred bytes, sleeping while the bucket is in debt."""
+
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+
+            self._tokens = min(self.rate, self._tokens + elapsed * self.rate)
+            self._tokens -= amount
+            self._updated = now
+
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait:
+            time.sleep(wait)
+
+
+class HostLimiter:
+    """Limit simultaneous transfers to the same host.
+
+    Args:
+        max_connections: Maximum transfers for every host.
+    """
+
+    def __init__(self, max_connections: int):
+        if max_connections < 1:
+            raise ValueError("Host connections must be at least 1.")
+
+        self.max_connections = max_connections
+
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self, url: str, connections: int = 1) -> Iterator[int]:
+        """Wait a free slot for the host of `url`.
+
+        Args:
+            url: URL to connect with.
+            connections: Connections wanted. Only the first slot is waited,
+                the others are taken if they are free.
+
+        Yields:
+            Number of connections which can be opened.
+        """
+
+        host = urlsplit(url).hostname or ""
+
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_connections)
+                self._semaphores[host] = semaphore
+
+        with semaphore:
+            taken = 1
+
+            while taken < connections and semaphore.acquire(blocking=False):
+                taken += 1
+
+            try:
+                yield taken
+            finally:
+                for _ in range(taken - 1):
+                    semaphore.release()
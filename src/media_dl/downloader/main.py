@@ -1,18 +1,34 @@
 import concurrent.futures as cf
+import itertools
+import threading
+from collections.abc import Iterable, Sized
+from contextlib import nullcontext
 from pathlib import Path
 
 from loguru import logger
 
+from media_dl.downloader.archive import DownloadArchive
+from media_dl.downloader.bus import ProgressBus
 from media_dl.downloader.config import FormatConfig
+from media_dl.downloader.index import OutputIndex
+from media_dl.downloader.journal import DownloadJournal
+from media_dl.downloader.limits import HostLimiter, RateLimiter
 from media_dl.downloader.pipeline import DownloadPipeline
+from media_dl.downloader.stages import STAGE, StagedExecutor
+from media_dl.downloader.states.debug import debug_callback
 from media_dl.downloader.states.progress import ProgressCallback
 from media_dl.exceptions import DownloadError, OutputTemplateError
-from media_dl.models.content.list import MediaList
+from media_dl.metrics import Metrics
+from media_dl.models.content.list import LazyPlaylist, MediaList
 from media_dl.models.content.media import LazyMedia
 from media_dl.models.progress.media import MediaDownloadCallback
+from media_dl.retry import RetryPolicy
 from media_dl.types import FILE_FORMAT, StrPath
 
-MediaResult = MediaList | LazyMedia
+MediaResult = MediaList | LazyMedia | Iterable[LazyMedia]
+
+QUEUE_FACTOR = 2
+"""Medias submitted ahead per thread."""
 
 
 class MediaDownloader:
@@ -25,6 +41,18 @@ class MediaDownloader:
         use_cache: bool = True,
         ffmpeg_path: StrPath | None = None,
         embed_metadata: bool = True,
+        concurrent_fragments: int = 1,
+        connections_per_file: int = 1,
+        resolve_workers: int | None = None,
+        download_workers: int | None = None,
+        process_workers: int | None = None,
+        resume: bool = False,
+        archive: StrPath | None = None,
+        limit_rate: float | None = None,
+        host_connections: int | None = None,
+        retry: RetryPolicy | None = None,
+        progress_rate: float = 10.0,
+        metrics: Metrics | None = None,
     ):
         """Multi-thread media downloader.
 
@@ -38,10 +66,24 @@ class MediaDownloader:
             use_cache: Extract/save media results from cache.
             ffmpeg_path: Path to FFmpeg executable. By default, it will get the global installed FFmpeg.
             embed_metadata: Embed title, uploader, thumbnail, subtitles, etc. (FFmpeg)
+            concurrent_fragments: Fragments to download at the same time for HLS/DASH formats.
+            connections_per_file: Connections to download large HTTP formats in byte ranges.
+            resolve_workers: Maximum medias to extract at the same time. Defaults to `threads`.
+            download_workers: Maximum medias to download at the same time. Defaults to `threads`.
+            process_workers: Maximum medias to postprocess at the same time. Defaults to `threads`.
+            resume: Keep a journal and an index of files in the output directory,
+                to resume interrupted downloads and skip completed ones.
+            archive: File to record downloaded medias and skip them before extraction.
+            limit_rate: Maximum bytes per second of all downloads together.
+            host_connections: Maximum simultaneous transfers to the same host.
+            retry: How to retry transient errors. Defaults to `RetryPolicy()`.
+            progress_rate: Progress updates per second of each media in batch downloads.
+            metrics: Collect timings and counters of every pipeline stage.
             show_progress: Choice if render download progress.
 
         Raises:
             FileNotFoundError: `ffmpeg` path not is a FFmpeg executable.
+            ValueError: Limits or progress rate are not positive numbers.
         """
 
         self.config = FormatConfig(
@@ -50,32 +92,87 @@ class MediaDownloader:
             output=Path(output),
             ffmpeg_path=Path(ffmpeg_path) if ffmpeg_path else None,
             embed_metadata=embed_metadata,
+            concurrent_fragments=concurrent_fragments,
+            connections_per_file=connections_per_file,
         )
         self.threads = threads
         self.use_cache = use_cache
+        self.workers: dict[STAGE, int] = {
+            "resolve": resolve_workers or threads,
+            "download": download_workers or threads,
+            "process": process_workers or threads,
+        }
+        self.resume = resume
+        self.archive = DownloadArchive(archive) if archive else None
+        self.rate_limiter = RateLimiter(limit_rate) if limit_rate else None
+        self.host_limiter = HostLimiter(host_connections) if host_connections else None
+        self.retry = retry or RetryPolicy()
+
+        if progress_rate <= 0:
+            raise ValueError("Progress rate must be greater than 0.")
+
+        self.progress_rate = progress_rate
+        self.metrics = metrics
+        self._executor: StagedExecutor | None = None
+        self._journal: DownloadJournal | None = None
+        self._journal_lock = threading.Lock()
+
+    @property
+    def journal(self) -> DownloadJournal | None:
+        """Journal of the output directory, created on first use."""
+
+        if not self.resume:
+            return None
+
+        with self._journal_lock:
+            if self._journal:
+                return self._journal
+
+            directory = self.config.output
+
+            # Output is a file template, like "music/{uploader} - {title}".
+            if not directory.is_dir():
+                directory = directory.parent
+
+            # Use its static part, which is the same before and after downloads.
+            parts = itertools.takewhile(lambda p: "{" not in p, directory.parts)
+            self._journal = DownloadJournal(Path(*parts))
+            return self._journal
+
+    @property
+    def stage_depth(self) -> dict[STAGE, int]:
+        """Medias queued or running in each stage of the current batch."""
+
+        if self._executor:
+            return self._executor.depth
+        else:
+            return {stage: 0 for stage in self.workers}
 
     def download(
         self,
         media: LazyMedia,
         on_progress: MediaDownloadCallback | None = ProgressCallback(),
-    ) -> Path:
+        playlist: LazyPlaylist | None = None,
+    ) -> Path | None:
         """Single download a `Media` result.
 
         Args:
             media: Target `Media` to download.
             on_progress: Callback function to get progress information.
+            playlist: `Playlist` where the media comes from.
 
         Returns:
-            Path to downloaded file.
+            Path to downloaded file, or `None` if the media was archived
+            without a recorded file.
         """
 
-        pipeline = DownloadPipeline(
-            self.config,
-            media,
-            cache=self.use_cache,
-            on_progress=on_progress,
-        )
-        return pipeline.run()
+        index = OutputIndex(persist=self.resume)
+        pipeline = self._pipeline(media, playlist, on_progress, index)
+
+        try:
+            return pipeline.run()
+        finally:
+            index.save()
 
     def download_all(
         self,
@@ -84,60 +181,185 @@ class MediaDownloader:
     ) -> list[Path]:
         """Batch download any result.
 
+        Medias can also be provided as any iterable, like a generator.
+
         Returns:
             List of paths to downloaded files.
         """
 
         medias = self._data_to_list(data)
+        playlist = data if isinstance(data, LazyPlaylist) else None
+
+        return self._download_many(medias, playlist, on_progress)
+
+    def download_stream(
+        self,
+        playlist: LazyPlaylist,
+        on_progress: MediaDownloadCallback | None = ProgressCallback(),
+    ) -> list[Path]:
+        """Batch download a `Playlist` while its entries are extracted.
+
+        Downloads start as soon as the first page of entries arrives. Use it
+        with `Playlist.from_url_lazy` to avoid extracting the full playlist first.
+
+        Returns:
+            List of paths to downloaded files.
+        """
+
+        return self._download_many(
+            playlist.iter_entries(self.use_cache),
+            playlist,
+            on_progress,
+        )
+
+    def _download_many(
+        self,
+        medias: Iterable[LazyMedia],
+        playlist: LazyPlaylist | None = None,
+        on_progress: MediaDownloadCallback | None = ProgressCallback(),
+    ) -> list[Path]:
         paths: list[Path] = []
+        index = OutputIndex(persist=self.resume)
 
         if on_progress:
-            on_progress = ProgressCallback()
-            on_progress.counter.reset(total=len(medias))
+            on_progress = ProgressCallback(
+                linger=getattr(on_progress, "linger", True),
+            )
+            on_progress.counter.reset(
+                total=len(medias) if isinstance(medias, Sized) else None
+            )
             on_progress.start()
 
+        bus = ProgressBus(self.progress_rate)
+
+        if on_progress:
+            bus.subscribe(on_progress)
+            bus.subscribe(debug_callback)
+
         success = 0
         errors = 0
 
         with (
             # Temporal workaround
-            on_progress,  # type: ignore
-            cf.ThreadPoolExecutor(max_workers=self.threads) as executor,
+            on_progress or nullcontext(),  # type: ignore
+            bus,
+            StagedExecutor(self.workers) as executor,
         ):
-            futures = {
-                executor.submit(self.download, media, on_progress): media
-                for media in medias
-            }
+            self._executor = executor
+
+            # Keep a bounded amount of medias in flight, pulling more as slots free up.
+            items = iter(medias)
+            futures: dict[cf.Future[Path | None], LazyMedia] = {}
+            failed: list[LazyMedia] = []
+            final_pass = False
+
+            def _fill():
+                while len(futures) < sum(self.workers.values()) * QUEUE_FACTOR:
+                    media = next(items, None)
+
+                    if media is None:
+                        break
+
+                    pipeline = self._pipeline(
+                        media,
+                        playlist,
+                        bus if on_progress else None,
+                        index,
+                        transfers=executor.transfers,
+                    )
+                    futures[executor.submit(pipeline)] = media
 
             try:
-                for future in cf.as_completed(futures):
-                    try:
-                        paths.append(future.result())
-                        success += 1
-                    except (ConnectionError, DownloadError) as e:
-                        logger.error(f"Failed to download: {e}")
-                        errors += 1
-                    except OutputTemplateError as e:
-                        logger.error(str(e).strip('"'))
-                        executor.shutdown(wait=False, cancel_futures=True)
-                        raise SystemExit()
+                _fill()
+
+                while futures:
+                    done, _ = cf.wait(futures, return_when=cf.FIRST_COMPLETED)
+
+                    for future in done:
+                        media = futures.pop(future)
+
+                        try:
+                            if path := future.result():
+                                paths.append(path)
+
+                            success += 1
+                        except (ConnectionError, DownloadError) as e:
+                            logger.error(f"Failed to download: {e}")
+                            errors += 1
+
+                            if getattr(e, "retryable", False) and not final_pass:
+                                failed.append(media)
+                        except OutputTemplateError as e:
+                            logger.error(str(e).strip('"'))
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            raise SystemExit()
+
+                    logger.debug("Stage queues: {depth}", depth=executor.depth)
+                    _fill()
+
+                    # Last chance for transient errors, once everything else is done.
+                    if (
+                        not futures
+                        and failed
+                        and self.retry.final_pass
+                        and not final_pass
+                    ):
+                        logger.info(
+                            "🔁 Retrying {count} failed medias.", count=len(failed)
+                        )
+
+                        if on_progress:
+                            on_progress.counter.advance(-len(failed))
+
+                        errors -= len(failed)
+                        items = iter(failed.copy())
+                        failed.clear()
+                        final_pass = True
+                        _fill()
             except KeyboardInterrupt:
                 logger.warning(
                     "❗ Canceling downloads... (press Ctrl+C again to force)"
                 )
                 executor.shutdown(wait=False, cancel_futures=True)
                 raise
+            finally:
+                self._executor = None
+                index.save()
 
         logger.debug(
             "{current} of {total} medias completed. {errors} errors.",
             current=success,
-            total=len(medias),
+            total=success + errors,
             errors=errors,
         )
 
         return paths
 
-    def _data_to_list(self, data: MediaResult) -> list[LazyMedia]:
+    def _pipeline(
+        self,
+        media: LazyMedia,
+        playlist: LazyPlaylist | None = None,
+        on_progress: MediaDownloadCallback | None = None,
+        index: OutputIndex | None = None,
+        transfers: cf.Executor | None = None,
+    ) -> DownloadPipeline:
+        return DownloadPipeline(
+            self.config,
+            media,
+            playlist=playlist,
+            cache=self.use_cache,
+            on_progress=on_progress,
+            journal=self.journal,
+            index=index,
+            archive=self.archive,
+            rate_limiter=self.rate_limiter,
+            host_limiter=self.host_limiter,
+            retry=self.retry,
+            metrics=self.metrics,
+            transfers=transfers,
+        )
+
+    def _data_to_list(self, data: MediaResult) -> Iterable[LazyMedia]:
         medias = []
 
         match data:
@@ -145,6 +367,8 @@ class MediaDownloader:
                 medias = [data]
             case MediaList():
                 medias = data.medias
+            case Iterable():
+                medias = data
             case _:
                 raise TypeError(data)
 
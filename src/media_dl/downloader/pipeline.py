@@ -1,14 +1,28 @@
+import concurrent.futures as cf
 import shutil
-from contextlib import contextmanager
+import threading
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TypeVar
 
 from loguru import logger
+from pydantic import ValidationError
 from yt_dlp.postprocessor.ffmpeg import FFmpegPostProcessorError
 
+from media_dl.downloader.archive import DownloadArchive
+from media_dl.downloader.bus import ProgressBus
 from media_dl.downloader.config import FormatConfig
+from media_dl.downloader.index import OutputIndex
+from media_dl.downloader.journal import DownloadJournal
+from media_dl.downloader.limits import HostLimiter, RateLimiter
 from media_dl.downloader.selector import FormatSelector
 from media_dl.downloader.states.debug import debug_callback
-from media_dl.exceptions import DownloadError
+from media_dl.exceptions import DownloadError, MediaError
+from media_dl.metrics import MetricEvent, Metrics
+from media_dl.models.content.base import _save_cache, last_cache_hit
 from media_dl.models.content.list import LazyPlaylist, Playlist
 from media_dl.models.content.media import LazyMedia, Media
 from media_dl.models.format.types import AudioFormat, Format, VideoFormat
@@ -28,10 +42,32 @@ from media_dl.models.progress.processor import (
     ProcessorStateType,
 )
 from media_dl.path import get_tempfile
-from media_dl.processor import MediaProcessor
+from media_dl.processor import MediaProcessor, ProcessorPlan, media_tags
+from media_dl.retry import NO_RETRY, RetryPolicy
+from media_dl.tagger import MediaTagger
 from media_dl.template.parser import generate_output_template
+from media_dl.ydl.downloader import is_fragmented
+from media_dl.ydl.segmented import supports_segments
 from media_dl.ydl.types import SupportedExtensions, ThumbnailSupport
 
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class PipelinePlan:
+    """Data shared between the stages of a `DownloadPipeline`."""
+
+    media: Media
+    output: Path
+    video_format: VideoFormat | None = None
+    audio_format: AudioFormat | None = None
+    video_file: Path | None = None
+    audio_file: Path | None = None
+
+    @property
+    def format(self) -> Format | None:
+        return self.video_format or self.audio_format
+
 
 class DownloadPipeline:
     """Handles the lifecycle of a single media download."""
@@ -43,49 +79,181 @@ class DownloadPipeline:
         playlist: LazyPlaylist | None = None,
         on_progress: MediaDownloadCallback | None = None,
         cache: bool = True,
+        journal: DownloadJournal | None = None,
+        index: OutputIndex | None = None,
+        archive: DownloadArchive | None = None,
+        rate_limiter: RateLimiter | None = None,
+        host_limiter: HostLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        metrics: Metrics | None = None,
+        transfers: cf.Executor | None = None,
     ):
         self.id = media.id
         self.media = media
         self.playlist = playlist
         self.config = config
         self.cache = cache
+        self.journal = journal
+        self.index = index or OutputIndex()
+        self.archive = archive
+        self.rate_limiter = rate_limiter
+        self.host_limiter = host_limiter
+        self.retry = retry or NO_RETRY
+        self.metrics = metrics
+        self.transfers = transfers
         self.progress = lambda d: None
 
-        if on_progress:
+        if isinstance(on_progress, ProgressBus):
+            # Subscribers are called by the bus, outside download threads.
+            self.progress = on_progress.publish
+        elif on_progress:
             self.progress = lambda state: [
                 f(state) for f in (on_progress, debug_callback)
             ]
 
         logger.debug(self.config)
 
-    def run(self) -> Path:
+    def run(self) -> Path | None:
+        plan = self.stage_resolve()
+
+        if plan is None or isinstance(plan, Path):
+            return plan
+
+        plan = self.stage_download(plan)
+        return self.stage_process(plan)
+
+    def stage_resolve(self) -> PipelinePlan | Path | None:
+        """Network-bound stage: resolve data, select formats and check existence.
+
+        Returns:
+            The plan to continue with, or the existing file if the media was
+            skipped. `None` if it was archived without a recorded file.
+        """
+
+        if self.check_archive():
+            return self.archive.get(self.media)  # type: ignore
+
+        if completed := self.check_journal():
+            return completed
+
         # Resolve Data
         media, playlist = self.resolve_media()
 
         # Select Formats
-        video_fmt, audio_fmt = FormatSelector(self.config).resolve(media)
-        format = video_fmt or audio_fmt
+        with self._span("select_formats"):
+            video_fmt, audio_fmt = self.select_formats(media)
+            format = video_fmt or audio_fmt
 
         #  Calculate Path & Check Existence
-        output = self.resolve_output()
-        output = generate_output_template(output, media, playlist, format)
+        with self._span("check_duplicate"):
+            output = self.resolve_output()
+            output = generate_output_template(output, media, playlist, format)
+            duplicate = self.check_output_duplicate(output)
 
-        if duplicate := self.check_output_duplicate(output):
+        if duplicate:
             return duplicate
 
-        try:
-            # Download File
-            downloaded_file = self.download_formats(video_fmt, audio_fmt)
+        if self.journal:
+            self.journal.update(
+                self.media,
+                "resolved",
+                profile=self.config.profile,
+                url=media.url,
+                formats=[f.id for f in (video_fmt, audio_fmt) if f],
+            )
+
+        return PipelinePlan(
+            media=media,
+            output=output,
+            video_format=video_fmt,
+            audio_format=audio_fmt,
+        )
+
+    def stage_download(self, plan: PipelinePlan) -> PipelinePlan:
+        """Bandwidth-bound stage: download the formats."""
+
+        with self._handle_errors():
+            plan.video_file, plan.audio_file = self._retry(
+                self.download_formats,
+                plan.video_format,
+                plan.audio_format,
+            )
+
+        if self.journal:
+            self.journal.update(
+                self.media,
+                "downloaded",
+                downloaded_bytes=sum(
+                    f.stat().st_size for f in (plan.video_file, plan.audio_file) if f
+                ),
+            )
 
-            if self.config.ffmpeg_path:
-                # Process File
-                downloaded_file = self.process(downloaded_file, media, format)
+        return plan
+
+    def stage_process(self, plan: PipelinePlan) -> Path:
+        """CPU-bound stage: merge and postprocess the files, then move to final path."""
+
+        filepath = plan.video_file or plan.audio_file
+
+        if not filepath:
+            raise DownloadError("Nothing to process, formats are not downloaded.")
+
+        with self._handle_errors():
+            # Process File
+            filepath = self.process(plan)
+
+        if self.journal:
+            self.journal.update(self.media, "processed")
+
+        # Complete (Move to target)
+        return self.move_to_final(filepath, plan.output)
+
+    @contextmanager
+    def _handle_errors(self):
+        try:
+            yield
         except ConnectionError as e:
             self.progress(ErrorState(id=self.id, message=str(e)))
-            raise DownloadError(str(e))
+            raise DownloadError(
+                str(e),
+                retryable=getattr(e, "retryable", False),
+                retry_after=getattr(e, "retry_after", None),
+            )
 
-        # Complete (Move to target)
-        return self.move_to_final(downloaded_file, output)
+    def _span(
+        self, name: str, **attributes
+    ) -> AbstractContextManager[MetricEvent | None]:
+        """Measure a stage when metrics are enabled."""
+
+        if self.metrics:
+            return self.metrics.span(name, self.id, **attributes)
+        return nullcontext()
+
+    def _retry(self, function: Callable[..., T], *args) -> T:
+        """Call a function again while it fails with a transient error."""
+
+        attempt = 0
+
+        while True:
+            try:
+                return function(*args)
+            except MediaError as err:
+                if not err.retryable or attempt + 1 >= self.retry.attempts:
+                    raise
+
+                delay = self.retry.delay(attempt, err.retry_after)
+                attempt += 1
+
+                if self.metrics:
+                    self.metrics.count("retries")
+
+                logger.debug(
+                    '"{id}": {error} Retrying in {delay:.1f} seconds.',
+                    id=self.id,
+                    error=str(err),
+                    delay=delay,
+                )
+                time.sleep(delay)
 
     def resolve_media(self) -> tuple[Media, Playlist | None]:
         self.progress(ResolvingState(id=self.id, media=self.media))
@@ -93,15 +261,110 @@ class DownloadPipeline:
         media = self.media
         playlist = self.playlist
 
-        if not isinstance(media, Media):
-            media = media.resolve(self.cache)
-        if playlist and not isinstance(playlist, Playlist):
-            playlist = playlist.resolve(self.cache)
+        with self._span("resolve"):
+            if not isinstance(media, Media):
+                media = self._retry(media.resolve, self.cache)
+
+                if self.metrics and self.cache:
+                    hit = last_cache_hit()
+                    self.metrics.count("cache_hits" if hit else "cache_misses")
+
+                try:
+                    # Cached fields are validated on first access, check them now.
+                    media.materialize()
+                except ValidationError as err:
+                    logger.debug(
+                        '"{id}": Invalid cached data, extracting again: {error}',
+                        id=self.id,
+                        error=err,
+                    )
+                    media = self._retry(self.media.resolve, False)
+
+                    # Replace the corrupt entry.
+                    _save_cache(media, self.media.url, media.url)
+            if playlist and not isinstance(playlist, Playlist):
+                playlist = self._retry(playlist.resolve, self.cache)
 
         self.progress(ResolvedState(id=self.id, media=media))
 
         return media, playlist
 
+    def check_archive(self) -> bool:
+        """Skip archived medias, without resolving them.
+
+        The skipped file is only known if the archive recorded its path.
+        """
+
+        if not self.archive or self.media not in self.archive:
+            return False
+
+        path = self.archive.get(self.media)
+
+        self.progress(ResolvingState(id=self.id, media=self.media))
+        self.progress(SkippedState(id=self.id, filepath=path))
+        return True
+
+    def check_journal(self) -> Path | None:
+        """Skip medias completed in a previous run, without resolving them."""
+
+        if not self.journal:
+            return None
+
+        entry = self.journal.get(self.media)
+
+        if (
+            entry
+            and entry.state == "completed"
+            and entry.filepath
+            # Downloaded with other format, quality or output.
+            and entry.profile == self.config.profile
+        ):
+            path = Path(entry.filepath)
+
+            if path.is_file():
+                self.progress(ResolvingState(id=self.id, media=self.media))
+                self.progress(SkippedState(id=self.id, filepath=path))
+                return path
+
+        return None
+
+    def select_formats(
+        self,
+        media: Media,
+    ) -> tuple[VideoFormat | None, AudioFormat | None]:
+        """Select formats to download, reusing the ones of an interrupted run.
+
+        Formats of the run are only reused if they were selected with the same
+        options, otherwise its partial files are discarded.
+        """
+
+        video_fmt, audio_fmt = FormatSelector(self.config).resolve(media)
+
+        if not self.journal or not (entry := self.journal.get(self.media)):
+            return video_fmt, audio_fmt
+
+        if entry.state not in ("downloading", "downloaded") or not entry.formats:
+            return video_fmt, audio_fmt
+
+        try:
+            formats = [media.formats.get_by_id(id) for id in entry.formats]
+        except IndexError:
+            formats = []
+
+        old_video = next((f for f in formats if isinstance(f, VideoFormat)), None)
+        old_audio = next((f for f in formats if isinstance(f, AudioFormat)), None)
+
+        if (
+            formats
+            and entry.profile == self.config.profile
+            and bool(old_video) == bool(video_fmt)
+            and bool(old_audio) == bool(audio_fmt)
+        ):
+            return old_video, old_audio
+
+        self.journal.discard(self.media)
+        return video_fmt, audio_fmt
+
     def resolve_output(self) -> Path:
         output = self.config.output
 
@@ -112,174 +375,423 @@ class DownloadPipeline:
         return output
 
     def check_output_duplicate(self, output: Path) -> Path | None:
-        for path in output.parent.iterdir():
-            if path.is_file() and path.stem == output.name:
-                extension = path.suffix[1:]
-
-                if (
-                    self.config.type == "video"
-                    and extension in SupportedExtensions.video
-                    or self.config.type == "audio"
-                    and extension in SupportedExtensions.audio
-                ):
-                    self.progress(SkippedState(id=self.id, filepath=path))
-                    return path
+        for extension in sorted(self.index.extensions(output)):
+            if (
+                self.config.type == "video"
+                and extension in SupportedExtensions.video
+                or self.config.type == "audio"
+                and extension in SupportedExtensions.audio
+            ):
+                path = output.parent / f"{output.name}.{extension}"
+
+                if self.archive:
+                    self.archive.add(self.media, path)
+
+                self.progress(SkippedState(id=self.id, filepath=path))
+                return path
 
     def download_formats(
         self,
         video_fmt: VideoFormat | None = None,
         audio_fmt: AudioFormat | None = None,
-    ) -> Path:
-        """Orchestrates the physical download of bytes."""
+    ) -> tuple[Path | None, Path | None]:
+        """Orchestrates the physical download of bytes.
+
+        Returns:
+            Downloaded video and audio files.
+        """
 
         downloading = DownloadingState(id=self.id)
         downloading.total_bytes = sum(
             f.filesize or 0 for f in [video_fmt, audio_fmt] if f
         )
 
-        video_file = None
-        audio_file = None
-
-        video_bytes = 0
-        audio_bytes = 0
+        lock = threading.Lock()
+        cancel = threading.Event()
+        errors: list[BaseException] = []
+        states: dict[bool, FormatState] = {}
+        transferred: dict[bool, float] = {}
 
         def _update_progress(fmt_state: FormatState, is_video: bool):
-            nonlocal video_bytes, audio_bytes
+            # Raising inside the YT-DLP hook aborts the sibling transfer.
+            if cancel.is_set():
+                raise DownloadError("Download canceled.")
 
-            if is_video:
-                video_bytes = fmt_state.downloaded_bytes
-            else:
-                audio_bytes = fmt_state.downloaded_bytes
+            with lock:
+                # First report could include bytes of a resumed file.
+                last = transferred.get(is_video, fmt_state.downloaded_bytes)
+                transferred[is_video] = max(last, fmt_state.downloaded_bytes)
+                consumed = transferred[is_video] - last
+                states[is_video] = fmt_state
 
-            downloading.downloaded_bytes = video_bytes + audio_bytes
-            downloading.speed = fmt_state.speed
-            downloading.elapsed = fmt_state.elapsed
+                downloading.downloaded_bytes = sum(
+                    s.downloaded_bytes for s in states.values()
+                )
+                downloading.speed = sum(s.speed for s in states.values())
+                downloading.elapsed = max(s.elapsed for s in states.values())
 
-            self.progress(downloading)
+                self.progress(downloading)
+
+            # Hooks of several fragments could wait here at the same time.
+            if self.rate_limiter and consumed:
+                self.rate_limiter.consume(consumed)
+
+        def _download(format: Format) -> Path:
+            is_video = isinstance(format, VideoFormat)
 
-        def _log(format: Format):
-            type = "video" if isinstance(format, VideoFormat) else "audio"
             logger.debug(
                 'Downloading {type} format "{format_id}" (extension:{extension} | quality:{quality})',
-                type=type,
+                type="video" if is_video else "audio",
                 format_id=format.id,
                 extension=format.extension,
                 quality=format.quality,
             )
 
-        # Download Audio
-        if audio_fmt:
-            _log(audio_fmt)
-            audio_file = audio_fmt.download(
-                get_tempfile(),
-                lambda s: _update_progress(s, is_video=False),
-            )
+            if self.journal:
+                filepath = self.journal.part_file(self.media, format.id)
+            else:
+                filepath = get_tempfile()
+
+            format_info = format.to_ydl_dict()
+            connections = self.config.connections_per_file
+
+            if is_fragmented(format_info):
+                connections = self.config.concurrent_fragments
+            elif connections > 1 and not supports_segments(format_info, connections):
+                connections = 1
+
+            with (
+                # Every segment or fragment is a connection to the host.
+                self.host_limiter.acquire(format.url, connections)
+                if self.host_limiter
+                else nullcontext(connections) as connections,
+                self._span("download_format", format=format.id) as event,
+            ):
+                # Sibling could fail while this one waited a slot of the host.
+                if cancel.is_set():
+                    raise DownloadError("Download canceled.")
 
-        # Download Video
-        if video_fmt:
-            _log(video_fmt)
-            video_file = video_fmt.download(
-                get_tempfile(),
-                lambda s: _update_progress(s, is_video=True),
-            )
+                try:
+                    path = format.download(
+                        filepath,
+                        lambda s: _update_progress(s, is_video=is_video),
+                        retry=self.retry,
+                        concurrent_fragments=connections,
+                        connections=connections,
+                    )
+                except BaseException as e:
+                    if not cancel.is_set():
+                        errors.append(e)
+
+                    # Flag the sibling before its slot or thread is released.
+                    cancel.set()
+                    raise
+
+                if event:
+                    event.bytes = path.stat().st_size
+
+                return path
 
-        # Merge if necessary
-        if (
-            self.config.ffmpeg_path
-            and (video_file and video_fmt)
-            and (audio_file and audio_fmt)
+        video_file = None
+        audio_file = None
+
+        if self.journal:
+            self.journal.update(self.media, "downloading")
+
+        # Download Video and Audio in parallel, on shared threads if available.
+        with (
+            nullcontext(self.transfers)
+            if self.transfers
+            else cf.ThreadPoolExecutor(max_workers=2)
+        ) as executor:
+            futures = {
+                executor.submit(_download, fmt): is_video
+                for fmt, is_video in ((video_fmt, True), (audio_fmt, False))
+                if fmt
+            }
+
+            try:
+                for future in cf.as_completed(futures):
+                    if futures[future]:
+                        video_file = future.result()
+                    else:
+                        audio_file = future.result()
+            except BaseException as e:
+                cancel.set()
+
+                # A queued sibling never starts, a running one stops on its next hook.
+                for future in futures:
+                    future.cancel()
+
+                # Shared pools don't wait on exit, the sibling must stop first.
+                cf.wait(futures)
+
+                if self.journal:
+                    self.journal.update(
+                        self.media,
+                        "downloading",
+                        downloaded_bytes=downloading.downloaded_bytes,
+                    )
+
+                # Sibling could finish first with the cancellation, report the cause.
+                if errors and not isinstance(e, KeyboardInterrupt):
+                    raise errors[0] from None
+                raise
+
+        if not (video_file or audio_file):
+            raise DownloadError("Formats not founded.")
+
+        return video_file, audio_file
+
+    def merge_formats(self, plan: PipelinePlan) -> Path:
+        """Merge downloaded formats in a file, if necessary."""
+
+        if not (
+            (plan.video_file and plan.video_format)
+            and (plan.audio_file and plan.audio_format)
         ):
-            extension = self.config.convert or "mp4"
-            filepath = Path(f"{get_tempfile()}.{extension}")
+            return plan.video_file or plan.audio_file  # type: ignore
 
-            merging = MergingProcessorState(
-                id=self.id,
-                filepath=filepath,
-                stage="started",
-                video_format=video_fmt,
-                audio_format=audio_fmt,
-            )
+        extension = self.config.convert or "mp4"
+        filepath = Path(f"{get_tempfile()}.{extension}")
 
+        merging = MergingProcessorState(
+            id=self.id,
+            filepath=filepath,
+            stage="started",
+            video_format=plan.video_format,
+            audio_format=plan.audio_format,
+        )
+        self.progress(merging)
+
+        with self._span("merge_formats"):
             prc = MediaProcessor.from_formats_merge(
                 filepath,
-                formats=[(video_fmt, video_file), (audio_fmt, audio_file)],
+                formats=[
+                    (plan.video_format, plan.video_file),
+                    (plan.audio_format, plan.audio_file),
+                ],
                 ffmpeg_path=self.config.ffmpeg_path,
             )
 
-            merging.stage = "completed"
-            self.progress(merging)
+        merging.stage = "completed"
+        self.progress(merging)
+
+        return prc.filepath
+
+    def process(self, plan: PipelinePlan) -> Path:
+        """Postprocess downloaded files, in a single FFmpeg pass when possible."""
+
+        media = plan.media
+        format = plan.format
+        audio_file = plan.audio_file
+
+        # Transcoding can't be done while copying streams, it must run first.
+        if (
+            self.config.ffmpeg_path
+            and isinstance(format, AudioFormat)
+            and audio_file
+            and self.config.convert
+            and self.config.convert != format.extension
+        ):
+            prc = MediaProcessor(audio_file, self.config.ffmpeg_path)
+            self._change_audio_container(prc, self.config.convert)
+            audio_file = prc.filepath
+
+        # Audio containers are tagged in place, without rewriting the file.
+        # Mutagen can't write chapters, those are left to FFmpeg.
+        if (
+            isinstance(format, AudioFormat)
+            and audio_file
+            and MediaTagger.supports(audio_file.suffix[1:])
+            and not (
+                self.config.embed_metadata
+                and media.chapters
+                and self.config.ffmpeg_path
+            )
+        ):
+            return self.process_tags(audio_file, media)
+
+        if not self.config.ffmpeg_path:
+            return plan.video_file or audio_file  # type: ignore
 
-            return prc.filepath
-        elif video_file:
-            return video_file
-        elif audio_file:
-            return audio_file
+        if isinstance(format, VideoFormat):
+            extension = self.config.convert or "mp4"
         else:
-            raise DownloadError("Formats not founded.")
+            extension = (audio_file or plan.video_file or Path()).suffix[1:]
 
-    def process(
-        self,
-        filepath: Path,
-        media: Media,
-        format: Format | None = None,
-    ) -> Path:
-        prc = MediaProcessor(filepath, self.config.ffmpeg_path)
+        if not ProcessorPlan.supports(extension):
+            return self.process_steps(plan)
+
+        prc_plan = ProcessorPlan(
+            Path(f"{get_tempfile()}.{extension}"),
+            video=plan.video_file if isinstance(format, VideoFormat) else None,
+            audio=audio_file,
+        )
+
+        if isinstance(format, VideoFormat) and media.subtitles:
+            prc_plan.subtitles = media.subtitles.download(get_tempfile())
+
+        if media.thumbnails and extension in ThumbnailSupport:
+            prc_plan.thumbnail = media.thumbnails[-1].download(get_tempfile())
+            prc_plan.square_thumbnail = media.is_music
 
-        @contextmanager
-        def track_prc(name: ProcessorStateType):
+        if self.config.embed_metadata:
+            prc_plan.metadata = media_tags(media, media.is_music)
+            prc_plan.chapters = media.chapters or []
+
+        logger.debug(
+            '"{id}": Single pass processing: {operations}',
+            id=self.id,
+            operations=", ".join(prc_plan.operations),
+        )
+
+        if isinstance(format, VideoFormat) and plan.audio_format and plan.audio_file:
+            state = MergingProcessorState(
+                id=self.id,
+                filepath=prc_plan.filepath,
+                stage="started",
+                video_format=format,
+                audio_format=plan.audio_format,
+            )
+        else:
             state = ProcessorState(
                 id=self.id,
-                filepath=prc.filepath,
+                filepath=prc_plan.filepath,
                 stage="started",
-                processor=name,
+                processor="postprocess",
             )
-            self.progress(state)
 
-            try:
-                yield
-                state.stage = "completed"
-                state.filepath = prc.filepath
-                self.progress(state)
-            except Exception:
-                raise
+        self.progress(state)
+
+        with self._span(state.processor, operations=len(prc_plan.operations)):
+            prc = prc_plan.run(self.config.ffmpeg_path)
+
+        state.stage = "completed"
+        self.progress(state)
+
+        return prc.filepath
+
+    def process_tags(self, filepath: Path, media: Media) -> Path:
+        """Embed metadata and cover of an audio file in place with Mutagen.
+
+        FFmpeg is only used for covers which Mutagen can't embed as is.
+        """
+
+        thumbnail: Path | None = None
+
+        if media.thumbnails and filepath.suffix[1:] in ThumbnailSupport:
+            info = media.thumbnails[-1]
+            thumbnail = info.download(get_tempfile())
+
+            # Mutagen can't crop or convert images.
+            crop = media.is_music and not (info.width and info.width == info.height)
+
+            if not MediaTagger.image_mime(thumbnail) or crop:
+                if self.config.ffmpeg_path:
+                    prc = MediaProcessor(filepath, self.config.ffmpeg_path)
+
+                    with self._track_processor("embed_thumbnail", prc):
+                        prc.embed_thumbnail(thumbnail, square=media.is_music)
+
+                    thumbnail = None
+                elif not MediaTagger.image_mime(thumbnail):
+                    thumbnail = None
+
+        if not (thumbnail or self.config.embed_metadata):
+            return filepath
+
+        tagger = MediaTagger(filepath)
+        name = "embed_metadata" if self.config.embed_metadata else "embed_thumbnail"
+
+        with self._track_processor(name, tagger):
+            if thumbnail:
+                tagger.embed_thumbnail(thumbnail)
+            if self.config.embed_metadata:
+                tagger.embed_metadata(media_tags(media, media.is_music))
+
+            tagger.save()
+
+        return filepath
+
+    def process_steps(self, plan: PipelinePlan) -> Path:
+        """Postprocess downloaded files, running one FFmpeg invocation per step."""
+
+        media = plan.media
+        format = plan.format
+
+        prc = MediaProcessor(self.merge_formats(plan), self.config.ffmpeg_path)
 
         # Remuxing
         if isinstance(format, VideoFormat):
-            with track_prc("change_container"):
+            with self._track_processor("change_container", prc):
                 prc.change_container(self.config.convert or "mp4")
 
             if media.subtitles:
-                with track_prc("embed_subtitles"):
+                with self._track_processor("embed_subtitles", prc):
                     subtitles = media.subtitles.download(get_tempfile())
                     prc.embed_subtitles(subtitles)
 
         elif isinstance(format, AudioFormat):
             if self.config.convert and self.config.convert != format.extension:
-                try:
-                    with track_prc("change_container"):
-                        prc.change_container(self.config.convert)
-                except FFmpegPostProcessorError:
-                    with track_prc("convert_audio"):
-                        prc.convert_audio(self.config.convert)
+                self._change_audio_container(prc, self.config.convert)
 
         # Metadata
         if media.thumbnails:
             if prc.filepath.suffix[1:] in ThumbnailSupport:
-                with track_prc("embed_thumbnail"):
+                with self._track_processor("embed_thumbnail", prc):
                     thumbnail = media.thumbnails[-1].download(get_tempfile())
                     prc.embed_thumbnail(thumbnail, square=media.is_music)
 
         if self.config.embed_metadata:
-            with track_prc("embed_metadata"):
+            with self._track_processor("embed_metadata", prc):
                 prc.embed_metadata(media, media.is_music)
 
         return prc.filepath
 
+    @contextmanager
+    def _track_processor(
+        self,
+        name: ProcessorStateType,
+        prc: MediaProcessor | MediaTagger,
+    ):
+        state = ProcessorState(
+            id=self.id,
+            filepath=prc.filepath,
+            stage="started",
+            processor=name,
+        )
+        self.progress(state)
+
+        with self._span(name):
+            yield
+
+        state.stage = "completed"
+        state.filepath = prc.filepath
+        self.progress(state)
+
+    def _change_audio_container(self, prc: MediaProcessor, extension: str):
+        try:
+            with self._track_processor("change_container", prc):
+                prc.change_container(extension)
+        except FFmpegPostProcessorError:
+            with self._track_processor("convert_audio", prc):
+                prc.convert_audio(extension)
+
     def move_to_final(self, src: Path, dest: Path) -> Path:
         final_path = dest.parent / f"{dest.name}{src.suffix}"
         final_path.parent.mkdir(parents=True, exist_ok=True)
 
         shutil.move(src, final_path)
+        self.index.add(final_path)
+
+        if self.archive:
+            self.archive.add(self.media, final_path)
+
+        if self.journal:
+            self.journal.update(self.media, "completed", filepath=str(final_path))
+            self.journal.clear_parts(self.media)
+
         self.progress(CompletedState(id=self.id, filepath=final_path))
 
         return final_path
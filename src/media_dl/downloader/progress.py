@@ -17,7 +17,7 @@ from media_dl.rich import CONSOLE
 class CounterProgress:
     def __init__(
         self,
-        total: int = 1,
+        total: int | None = 1,
         disable: bool = False,
         visible: bool = True,
     ) -> None:
@@ -37,7 +37,7 @@ class CounterProgress:
             total=total,
         )
 
-    def reset(self, total: int = 1, visible: bool = True):
+    def reset(self, total: int | None = 1, visible: bool = True):
         self._progress.reset(self._task_id, total=total, visible=visible)
 
     def advance(self, advance: int = 1):
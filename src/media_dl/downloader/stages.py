@@ -0,0 +1,131 @@
+import concurrent.futures as cf
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Literal, get_args
+
+from media_dl.downloader.pipeline import DownloadPipeline, PipelinePlan
+
+STAGE = Literal["resolve", "download", "process"]
+
+
+class StagedExecutor:
+    """Run pipelines through a separate worker pool per stage.
+
+    Each stage is fed by the queue of its own pool, so CPU-bound processing
+    never takes slots from network-bound resolution or downloads. Formats of
+    each download run on `transfers`, long-lived threads which keep their
+    `YDL` instance between medias.
+
+    Args:
+        workers: Maximum threads for every stage.
+    """
+
+    def __init__(self, workers: dict[STAGE, int]):
+        self._pools = {
+            stage: cf.ThreadPoolExecutor(
+                max_workers=workers[stage],
+                thread_name_prefix=f"media-dl-{stage}",
+            )
+            for stage in get_args(STAGE)
+        }
+        self.transfers = cf.ThreadPoolExecutor(
+            # Video and audio of every download.
+            max_workers=workers["download"] * 2,
+            thread_name_prefix="media-dl-transfer",
+        )
+        self._depth: dict[STAGE, int] = {stage: 0 for stage in get_args(STAGE)}
+        self._lock = threading.Lock()
+
+    @property
+    def depth(self) -> dict[STAGE, int]:
+        """Pipelines queued or running in each stage."""
+
+        with self._lock:
+            return dict(self._depth)
+
+    def submit(self, pipeline: DownloadPipeline) -> cf.Future[Path | None]:
+        """Schedule a pipeline through all stages.
+
+        Returns:
+            Future with the final path of the pipeline.
+        """
+
+        result: cf.Future[Path | None] = cf.Future()
+
+        def _resolved(plan: PipelinePlan | Path | None):
+            if plan is None or isinstance(plan, Path):
+                result.set_result(plan)
+            else:
+                self._run(
+                    "download", pipeline.stage_download, plan, result, _downloaded
+                )
+
+        def _downloaded(plan: PipelinePlan):
+            self._run(
+                "process", pipeline.stage_process, plan, result, result.set_result
+            )
+
+        self._run("resolve", pipeline.stage_resolve, None, result, _resolved)
+        return result
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        pools = [*self._pools.values(), self.transfers]
+
+        if cancel_futures:
+            for pool in pools:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        # In stage order, so finished stages can still feed the next one.
+        for pool in pools:
+            pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def _run(
+        self,
+        stage: STAGE,
+        function: Callable[..., Any],
+        argument: Any,
+        result: cf.Future,
+        callback: Callable[[Any], None],
+    ):
+        with self._lock:
+            self._depth[stage] += 1
+
+        try:
+            args = () if argument is None else (argument,)
+            future = self._pools[stage].submit(function, *args)
+        except RuntimeError:
+            # Executor already shutdown
+            self._leave(stage)
+            result.cancel()
+            return
+
+        def _done(future: cf.Future):
+            self._leave(stage)
+
+            if future.cancelled():
+                result.cancel()
+            elif error := future.exception():
+                result.set_exception(error)
+            else:
+                try:
+                    callback(future.result())
+                except BaseException as error:
+                    if not result.done():
+                        result.set_exception(error)
+
+                    # Interrupts must still reach the worker thread.
+                    if not isinstance(error, Exception):
+                        raise
+
+        future.add_done_callback(_done)
+
+    def _leave(self, stage: STAGE):
+        with self._lock:
+            self._depth[stage] -= 1
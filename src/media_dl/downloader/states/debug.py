@@ -59,6 +59,12 @@ def _processor_callback(progress: ProcessingState):
                     'Metadata embedded in "{file}".',
                     file=progress.filepath,
                 )
+            case "postprocess":
+                _log_debug(
+                    progress.id,
+                    'File processed in a single pass "{file}".',
+                    file=progress.filepath,
+                )
 
 
 def _log_debug(id: str, log: str, **kwargs):
@@ -2,6 +2,7 @@ import time
 from dataclasses import dataclass
 
 from loguru import logger
+from rich.console import RenderableType
 from rich.progress import TaskID
 
 from media_dl.downloader.progress import DownloadProgress
@@ -17,9 +18,19 @@ class Task:
 
 
 class ProgressCallback(DownloadProgress):
-    def __init__(self, disable: bool = False) -> None:
-        super().__init__(disable)
+    """Render progress of medias.
+
+    Args:
+        disable: Don't render anything.
+        linger: Keep finished rows visible for a moment. Rows are removed by
+            the renderer, callers never wait for it.
+    """
+
+    def __init__(self, disable: bool = False, linger: bool = True) -> None:
         self.ids: dict[str, Task] = {}
+        self.linger = linger
+        self._expiring: dict[TaskID, float] = {}
+        super().__init__(disable)
 
     def __call__(self, progress: MediaDownloadState):
         match progress.status:
@@ -50,11 +61,17 @@ class ProgressCallback(DownloadProgress):
                     status="Ready",
                 )
             case "skipped":
-                logger.info(
-                    'Skipped: "{media}" (Exists as "{extension}").',
-                    media=self.get(progress).name,
-                    extension=progress.extension,
-                )
+                if progress.extension:
+                    logger.info(
+                        'Skipped: "{media}" (Exists as "{extension}").',
+                        media=self.get(progress).name,
+                        extension=progress.extension,
+                    )
+                else:
+                    logger.info(
+                        'Skipped: "{media}" (Archived).',
+                        media=self.get(progress).name,
+                    )
 
                 self.update(self.get(progress).task_id, status="Skipped")
                 self.advance_counter(progress, 0.6)
@@ -105,8 +122,26 @@ class ProgressCallback(DownloadProgress):
 
     def advance_counter(self, progress: MediaDownloadState, delay: float):
         self.counter.advance()
-        time.sleep(delay)
-        self.remove_task(self.get(progress).task_id)
+        task_id = self.get(progress).task_id
+
+        if self.linger:
+            self._expiring[task_id] = time.monotonic() + delay
+        else:
+            self.remove_task(task_id)
+
+        self._remove_expired()
+
+    def get_renderable(self) -> RenderableType:
+        # Called by the refresh thread, which is the timer of lingering rows.
+        self._remove_expired()
+        return super().get_renderable()
+
+    def _remove_expired(self):
+        now = time.monotonic()
+
+        for task_id, expiration in list(self._expiring.items()):
+            if expiration <= now and self._expiring.pop(task_id, None) is not None:
+                self.remove_task(task_id)
 
     def log_debug(self, id: str, log: str, **kwargs):
         text = f'"{id}": {log}'
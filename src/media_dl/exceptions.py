@@ -2,7 +2,22 @@
 
 
 class MediaError(Exception):
-    """Base exception."""
+    """Base exception.
+
+    Args:
+        retryable: Error is transient and the operation could be retried.
+        retry_after: Seconds to wait before retry, requested by the server.
+    """
+
+    def __init__(
+        self,
+        *args: object,
+        retryable: bool = False,
+        retry_after: float | None = None,
+    ):
+        super().__init__(*args)
+        self.retryable = retryable
+        self.retry_after = retry_after
 
 
 class OutputTemplateError(MediaError, KeyError):
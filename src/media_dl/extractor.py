@@ -3,7 +3,12 @@
 from loguru import logger
 
 from media_dl.exceptions import ExtractError
-from media_dl.ydl.extractor import SEARCH_SERVICE, extract_info, extract_query
+from media_dl.ydl.extractor import (
+    SEARCH_SERVICE,
+    extract_info,
+    extract_info_lazy,
+    extract_query,
+)
 from media_dl.ydl.types import YDLExtractInfo
 
 PLAYLISTS_EXTRACTORS = ["YoutubeTab"]
@@ -37,6 +42,16 @@ def extract_url(url: str) -> YDLExtractInfo:
     return info
 
 
+def extract_url_lazy(url: str) -> YDLExtractInfo:
+    """Extract info from URL without resolving playlist entries."""
+
+    logger.debug("Extract URL (lazy): {url}", url=url)
+
+    info = extract_info_lazy(url)
+    info = _validate_info(info)
+    return info
+
+
 def is_playlist(info: YDLExtractInfo) -> bool:
     """Check if info is a playlist."""
 
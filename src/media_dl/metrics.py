@@ -0,0 +1,237 @@
+"""Timings and counters of download pipelines."""
+
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from loguru import logger
+
+
+@dataclass(slots=True)
+class MetricEvent:
+    """A finished stage of a media pipeline.
+
+    Args:
+        name: Stage name, like `resolve` or `download_format`.
+        media_id: ID of the media being processed.
+        start: Unix timestamp when the stage started.
+        duration: Seconds the stage took.
+        bytes: Transferred bytes, when it applies.
+        error: Exception name if the stage failed.
+        attributes: Additional data of the stage.
+    """
+
+    name: str
+    media_id: str
+    start: float
+    duration: float = 0
+    bytes: int = 0
+    error: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class StageStats:
+    count: int = 0
+    errors: int = 0
+    seconds: float = 0
+    max_seconds: float = 0
+    bytes: int = 0
+
+
+MetricCallback = Callable[[MetricEvent], None]
+
+
+class Metrics:
+    """Collect timings, bytes and counters of pipeline stages.
+
+    Every finished stage is aggregated and sent to subscribers as a
+    `MetricEvent`, to export them as logs or traces.
+    """
+
+    def __init__(self):
+        self.subscribers: list[MetricCallback] = []
+
+        self._stages: dict[str, StageStats] = {}
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: MetricCallback) -> Callable[[], None]:
+        """Add a subscriber, called from worker threads.
+
+        Returns:
+            Function to remove the subscriber.
+        """
+
+        self.subscribers.append(callback)
+        return lambda: self.subscribers.remove(callback)
+
+    @contextmanager
+    def span(
+        self, name: str, media_id: str, **attributes: Any
+    ) -> Iterator[MetricEvent]:
+        """Measure a stage. Yielded event can be updated before it ends."""
+
+        event = MetricEvent(name, media_id, time.time(), attributes=attributes)
+        started = time.perf_counter()
+
+        try:
+            yield event
+        except BaseException as err:
+            event.error = type(err).__name__
+            raise
+        finally:
+            event.duration = time.perf_counter() - started
+            self.record(event)
+
+    def record(self, event: MetricEvent) -> None:
+        with self._lock:
+            stats = self._stages.setdefault(event.name, StageStats())
+            stats.count += 1
+            stats.errors += bool(event.error)
+            stats.seconds += event.duration
+            stats.max_seconds = max(stats.max_seconds, event.duration)
+            stats.bytes += event.bytes
+
+        for callback in list(self.subscribers):
+            try:
+                callback(event)
+            # Exporter errors must not fail the measured stage.
+            except Exception:  # noqa: BLE001
+                logger.exception("Metrics subscriber failed.")
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increase a counter, like `retries` or `cache_hits`."""
+
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    @property
+    def stages(self) -> dict[str, StageStats]:
+        with self._lock:
+            return {name: replace(s) for name, s in self._stages.items()}
+
+    @property
+    def counters(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def to_prometheus(self, prefix: str = "media_dl") -> str:
+        """Metrics in Prometheus text exposition format."""
+
+        stages = self.stages
+        lines: list[str] = []
+
+        def _metric(name: str, type: str, help: str, values: dict[str, float]):
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {type}")
+            lines.extend(f"{prefix}_{key} {value}" for key, value in values.items())
+
+        if stages:
+            _metric(
+                "stage_seconds",
+                "summary",
+                "Time spent in each pipeline stage.",
+                {
+                    f"stage_seconds_{suffix}{{stage={_label(stage)}}}": value
+                    for stage, s in stages.items()
+                    for suffix, value in (("sum", s.seconds), ("count", s.count))
+                },
+            )
+            _metric(
+                "stage_max_seconds",
+                "gauge",
+                "Slowest run of each pipeline stage.",
+                {
+                    f"stage_max_seconds{{stage={_label(stage)}}}": s.max_seconds
+                    for stage, s in stages.items()
+                },
+            )
+            _metric(
+                "stage_errors_total",
+                "counter",
+                "Failed runs of each pipeline stage.",
+                {
+                    f"stage_errors_total{{stage={_label(stage)}}}": s.errors
+                    for stage, s in stages.items()
+                },
+            )
+            _metric(
+                "stage_bytes_total",
+                "counter",
+                "Bytes transferred by each pipeline stage.",
+                {
+                    f"stage_bytes_total{{stage={_label(stage)}}}": s.bytes
+                    for stage, s in stages.items()
+                    if s.bytes
+                },
+            )
+
+        for name, value in self.counters.items():
+            _metric(
+                f"{name}_total", "counter", f"Total {name}.", {f"{name}_total": value}
+            )
+
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """Human readable table of stages and counters."""
+
+        header = (
+            f"{'Stage':<20} {'Runs':>6} {'Errors':>6} {'Total':>9}"
+            f" {'Average':>9} {'Max':>9} {'Bytes':>12}"
+        )
+        lines = [header]
+
+        for name, s in self.stages.items():
+            lines.append(
+                f"{name:<20} {s.count:>6} {s.errors:>6} {s.seconds:>8.2f}s"
+                f" {s.seconds / s.count:>8.2f}s {s.max_seconds:>8.2f}s {s.bytes:>12}"
+            )
+
+        lines.extend(f"{name}: {value}" for name, value in self.counters.items())
+        return "\n".join(lines)
+
+
+def otel_hook(tracer: Any) -> MetricCallback:
+    """Export stages as OpenTelemetry spans.
+
+    Args:
+        tracer: `opentelemetry.trace.Tracer`, or any object with the same
+            `start_span` signature.
+
+    Returns:
+        Callback to subscribe with `Metrics.subscribe`.
+    """
+
+    def _export(event: MetricEvent):
+        start = int(event.start * 1e9)
+        span = tracer.start_span(
+            event.name,
+            start_time=start,
+            attributes={
+                "media.id": event.media_id,
+                "media.bytes": event.bytes,
+                **{f"media.{k}": v for k, v in event.attributes.items()},
+            },
+        )
+
+        if event.error:
+            span.set_attribute("error.type", event.error)
+
+        span.end(end_time=start + int(event.duration * 1e9))
+
+    return _export
+
+
+def _label(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
@@ -1,6 +1,9 @@
-from typing import Generic, TypeVar, overload
+import json
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Annotated, Any, ClassVar, Generic, TypeVar, overload
 
-from pydantic import BaseModel, RootModel
+from pydantic import BaseModel, PrivateAttr, RootModel, TypeAdapter
 from typing_extensions import Self
 
 from media_dl.ydl.types import YDLExtractInfo
@@ -17,6 +20,177 @@ class Serializable(BaseModel):
     def from_ydl_json(cls, data: str) -> Self:
         return cls.model_validate_json(data, by_alias=True)
 
+    def to_cache_json(self) -> str:
+        """Compact JSON by field names, without YT-DLP aliases and defaults."""
+
+        return self.model_dump_json(exclude_defaults=True)
+
+    @classmethod
+    def from_cache_json(cls, data: str) -> Self:
+        """Load data serialized by `to_cache_json`.
+
+        Raises:
+            ValidationError: Data doesn't match with model.
+        """
+
+        return cls.model_validate_json(data, by_alias=False, by_name=True)
+
+
+_deferred_lock = threading.RLock()
+
+
+class DeferredSerializable(Serializable):
+    """Model which heavy fields are validated on first access.
+
+    Only applies to instances loaded by `from_cache_json`, the remaining
+    fields are validated with the first parent model which doesn't have the
+    deferred fields.
+    """
+
+    deferred_fields: ClassVar[frozenset[str]] = frozenset()
+
+    _deferred: dict[str, Any] | None = PrivateAttr(None)
+
+    @classmethod
+    def from_cache_json(cls, data: str) -> Self:
+        raw = json.loads(data)
+
+        if not isinstance(raw, dict):
+            return super().from_cache_json(data)
+
+        deferred = {name: raw.pop(name) for name in cls.deferred_fields if name in raw}
+        light_model = _light_model(cls)
+        light = light_model.model_validate(raw, by_alias=False, by_name=True)
+        values = dict(light)
+
+        # Fields which the light model doesn't declare are validated one by one.
+        for name in cls.model_fields.keys() - light_model.model_fields.keys():
+            if name in cls.deferred_fields:
+                continue
+            elif name in raw:
+                values[name] = _field_adapter(cls, name).validate_python(
+                    raw[name], by_alias=False, by_name=True
+                )
+            elif cls.model_fields[name].is_required():
+                return super().from_cache_json(data)
+
+        fields = light.model_fields_set | deferred.keys() | (values.keys() & raw.keys())
+        model = cls.model_construct(fields, **values)
+
+        # Missing fields are filled with defaults, remove them to be resolved.
+        for name in cls.deferred_fields:
+            model.__dict__.pop(name, None)
+
+        model._deferred = deferred
+
+        if missing := cls.deferred_fields - deferred.keys():
+            model.materialize(*missing)
+
+        return model
+
+    def materialize(self, *names: str) -> None:
+        """Validate deferred fields, all of them by default.
+
+        Raises:
+            ValidationError: Cached data doesn't match with field.
+        """
+
+        for name in names or self.deferred_fields:
+            if name not in self.__dict__:
+                getattr(self, name)
+
+        if not self._deferred:
+            self._deferred = None
+
+    if not TYPE_CHECKING:
+
+        def __getattr__(self, name: str) -> Any:
+            if name in type(self).deferred_fields:
+                with _deferred_lock:
+                    return self._validate_deferred(name)
+
+            return super().__getattr__(name)
+
+    def _validate_deferred(self, name: str) -> Any:
+        if name in self.__dict__:
+            return self.__dict__[name]
+
+        deferred = self._deferred or {}
+        raw = deferred.get(name)
+        field = type(self).model_fields[name]
+
+        if raw is None and not field.is_required():
+            value = field.get_default(call_default_factory=True)
+        else:
+            value = _field_adapter(type(self), name).validate_python(
+                raw, by_alias=False, by_name=True
+            )
+
+        self.__dict__[name] = value
+        deferred.pop(name, None)
+
+        # Serialization follows the instance order, keep the fields order.
+        fields = list(type(self).model_fields)
+
+        for key in fields[fields.index(name) + 1 :]:
+            if key in self.__dict__:
+                self.__dict__[key] = self.__dict__.pop(key)
+
+        return value
+
+    def model_dump(self, **kwargs) -> dict[str, Any]:
+        # Templates only dump a few keys, don't validate unused fields.
+        if (include := kwargs.get("include")) is not None:
+            if names := self.deferred_fields & set(include):
+                self.materialize(*names)
+        else:
+            self.materialize()
+
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs) -> str:
+        self.materialize()
+        return super().model_dump_json(**kwargs)
+
+    def model_copy(self, **kwargs) -> Self:
+        self.materialize()
+        return super().model_copy(**kwargs)
+
+    def __eq__(self, other: object) -> bool:
+        self.materialize()
+
+        if isinstance(other, DeferredSerializable):
+            other.materialize()
+
+        return super().__eq__(other)
+
+    def __repr_args__(self):
+        self.materialize()
+        return super().__repr_args__()
+
+
+@lru_cache
+def _light_model(cls: type[DeferredSerializable]) -> type[BaseModel]:
+    for base in cls.__mro__[1:]:
+        if (
+            isinstance(base, type)
+            and issubclass(base, BaseModel)
+            and not issubclass(base, DeferredSerializable)
+            and not cls.deferred_fields & base.model_fields.keys()
+        ):
+            return base
+
+    raise TypeError(f"'{cls.__name__}' has no model without deferred fields.")
+
+
+@lru_cache
+def _field_adapter(cls: type[BaseModel], name: str) -> TypeAdapter:
+    field = cls.model_fields[name]
+
+    if field.metadata:
+        return TypeAdapter(Annotated[(field.annotation, *field.metadata)])
+    return TypeAdapter(field.annotation)
+
 
 T = TypeVar("T")
 
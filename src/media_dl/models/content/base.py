@@ -1,10 +1,13 @@
+import asyncio
+import concurrent.futures as cf
+import threading
 from abc import ABC, abstractmethod
 from typing import Annotated, Any, Generic, Literal, TypeVar
 
 from pydantic import AliasChoices, Field, model_validator
 from typing_extensions import Self
 
-from media_dl.cache import load_info, save_info
+from media_dl.cache import MODELS, load_info, save_info
 from media_dl.extractor import extract_search, extract_url, is_media, is_playlist
 from media_dl.models.base import Serializable
 from media_dl.ydl.extractor import SEARCH_SERVICE
@@ -27,15 +30,65 @@ TypeField = Annotated[
 # Helpers
 T = TypeVar("T", bound=Serializable)
 
+ASYNC_EXTRACT_WORKERS = 4
+"""Maximum extractions at the same time of async methods."""
+
+_async_executor: cf.ThreadPoolExecutor | None = None
+_async_executor_lock = threading.Lock()
+
+
+def _get_async_executor() -> cf.ThreadPoolExecutor:
+    global _async_executor
+
+    with _async_executor_lock:
+        if _async_executor is None:
+            _async_executor = cf.ThreadPoolExecutor(
+                max_workers=ASYNC_EXTRACT_WORKERS,
+                thread_name_prefix="media-dl-extract",
+            )
+
+        return _async_executor
+
+
+_lookup = threading.local()
+
+
+def last_cache_hit() -> bool:
+    """Check if the last cache lookup of current thread found the data."""
+
+    return getattr(_lookup, "hit", False)
+
+
+def _load_cache(cls: type[T], url: str) -> T | None:
+    _lookup.hit = True
+
+    if (model := MODELS.get((cls, url))) is not None:
+        return model
 
-def _load_cache(cls: type[T], url: str):
     if info := load_info(url):
         try:
-            return cls.from_ydl_json(info)
+            model = cls.from_cache_json(info)
         except ValueError:
-            raise TypeError(
-                f"'{url}' extracted from cache but data doesn't match with model"
-            )
+            # Entries saved by previous versions use YT-DLP keys.
+            try:
+                model = cls.from_ydl_json(info)
+            except ValueError:
+                raise TypeError(
+                    f"'{url}' extracted from cache but data doesn't match with model"
+                )
+
+        MODELS.put((cls, url), model)
+        return model
+
+    _lookup.hit = False
+    return None
+
+
+def _save_cache(model: Serializable, *keys: str):
+    for key in dict.fromkeys(keys):
+        MODELS.put((model.__class__, key), model)
+
+    save_info(keys[-1], model.to_cache_json())
 
 
 # Items
@@ -70,10 +123,23 @@ class Extract(Serializable):
 
         # Save to cache
         if use_cache:
-            save_info(cls.url, cls.to_ydl_json())
+            _save_cache(cls, url, cls.url)
 
         return cls
 
+    @classmethod
+    async def afrom_url(
+        cls,
+        url: str,
+        use_cache: bool = True,
+    ) -> Self:
+        """Async version of `from_url`, extracted in a bounded pool of threads."""
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_async_executor(), cls.from_url, url, use_cache
+        )
+
 
 T = TypeVar("T", bound=Extract)
 
@@ -149,6 +215,6 @@ class ExtractSearch(ExtractList):
 
         # Save to cache
         if use_cache:
-            save_info(cls.query, cls.to_ydl_json())
+            _save_cache(cls, cls.query)
 
         return cls
@@ -1,23 +1,94 @@
 from __future__ import annotations
 
+import concurrent.futures as cf
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 from typing import Annotated
 
-from pydantic import AliasChoices, Field
+from loguru import logger
+from pydantic import AliasChoices, Field, PrivateAttr, ValidationError
+from typing_extensions import Self
 
+from media_dl.exceptions import ExtractError
+from media_dl.extractor import extract_url_lazy, is_media, is_playlist
 from media_dl.models.content.base import (
     URL_CHOICES,
     ExtractList,
     ExtractSearch,
     LazyExtract,
+    _load_cache,
 )
-from media_dl.models.content.media import LazyMedia
+from media_dl.models.content.media import LazyMedia, Media
 from media_dl.models.content.metadata import Thumbnail
+from media_dl.ydl.extractor import iter_entries
+from media_dl.ydl.types import YDLExtractInfo
+
+
+@dataclass(slots=True)
+class ResolveResult:
+    medias: list[Media] = field(default_factory=list)
+    errors: dict[str, ExtractError | TypeError] = field(default_factory=dict)
+    """Failed medias by URL."""
 
 
 class MediaList(ExtractList):
     medias: LazyMedias = []
     playlists: LazyPlaylists = []
 
+    def resolve_all(
+        self, concurrency: int = 8, use_cache: bool = True
+    ) -> ResolveResult:
+        """Resolve all medias concurrently.
+
+        Repeated medias are resolved once and failed ones are collected
+        instead of raised.
+
+        Args:
+            concurrency: Maximum extractions at the same time.
+            use_cache: Extract/save media results from cache.
+
+        Returns:
+            Resolved medias in list order and errors.
+        """
+
+        unique: dict[tuple[str, str], LazyMedia] = {}
+
+        for media in self.medias:
+            unique.setdefault((media.extractor, media.id), media)
+
+        def _resolve(media: LazyMedia) -> Media:
+            if isinstance(media, Media):
+                return media
+            return media.resolve(use_cache)
+
+        result = ResolveResult()
+
+        with cf.ThreadPoolExecutor(
+            max_workers=concurrency,
+            thread_name_prefix="media-dl-prefetch",
+        ) as executor:
+            futures = {key: executor.submit(_resolve, m) for key, m in unique.items()}
+
+        for key, future in futures.items():
+            try:
+                result.medias.append(future.result())
+            except (ExtractError, TypeError) as err:
+                result.errors[unique[key].url] = err
+
+        return result
+
+    def prefetch(self, concurrency: int = 8, use_cache: bool = True) -> ResolveResult:
+        """Replace medias of the list with their resolved version.
+
+        Failed medias are kept as they are. See `resolve_all`.
+        """
+
+        result = self.resolve_all(concurrency, use_cache)
+        resolved = {(m.extractor, m.id): m for m in result.medias}
+
+        self.medias = [resolved.get((m.extractor, m.id), m) for m in self.medias]
+        return result
+
 
 class LazyPlaylist(MediaList, LazyExtract["Playlist"]):
     url: Annotated[
@@ -45,6 +116,67 @@ class LazyPlaylist(MediaList, LazyExtract["Playlist"]):
     uploader: str | None = None
     thumbnails: list[Thumbnail] = []
 
+    _entries: Iterable[YDLExtractInfo] | None = PrivateAttr(None)
+
+    @classmethod
+    def from_url_lazy(cls, url: str) -> Self:
+        """Extract only the playlist information.
+
+        Entries are not requested until `iter_entries` is consumed.
+
+        Raises:
+            TypeError: URL is not a playlist.
+            ExtractError: Something bad happens when extract.
+        """
+
+        info = extract_url_lazy(url)
+
+        if not is_playlist(info):
+            raise TypeError(f"'{url}' is not a playlist. Please use 'Media' instead.")
+
+        entries = info.pop("entries", None)
+
+        playlist = cls(**info)
+        playlist._entries = entries
+        return playlist
+
+    def iter_entries(self, use_cache: bool = True) -> Iterator[LazyMedia]:
+        """Stream playlist medias while they are extracted.
+
+        Nested playlists are expanded in place. Entries are yielded as soon as
+        each page arrives, without materializing the full playlist.
+
+        Raises:
+            ExtractError: Something bad happens when extract.
+        """
+
+        source = self
+
+        if use_cache and not (self.medias or self.playlists):
+            source = _load_cache(Playlist, self.url) or self
+
+        if source.medias or source.playlists:
+            yield from source.medias
+
+            for playlist in source.playlists:
+                yield from playlist.iter_entries(use_cache)
+            return
+
+        entries = self._entries
+        self._entries = None
+
+        if entries is None:
+            entries = extract_url_lazy(self.url).get("entries") or []
+
+        for entry in iter_entries(entries):
+            try:
+                if is_media(entry):
+                    yield LazyMedia(**entry)
+                elif is_playlist(entry):
+                    yield from LazyPlaylist(**entry).iter_entries(use_cache)
+            except ValidationError:
+                logger.debug("Ignored invalid playlist entry: {entry}", entry=entry)
+
     @property
     def _target_class(self):
         return Playlist
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import datetime
-from typing import Annotated
+from typing import Annotated, ClassVar
 
 from pydantic import (
     AfterValidator,
@@ -11,6 +11,7 @@ from pydantic import (
     PlainSerializer,
 )
 
+from media_dl.models.base import DeferredSerializable
 from media_dl.models.content.base import LazyExtract
 from media_dl.models.content.metadata import (
     Chapter,
@@ -52,9 +53,13 @@ class LazyMedia(MusicMetadata, LazyExtract["Media"]):
         return Media
 
 
-class Media(LazyMedia):
+class Media(LazyMedia, DeferredSerializable):
     """Online media representation."""
 
+    deferred_fields: ClassVar[frozenset[str]] = frozenset(
+        {"chapters", "subtitles", "formats"}
+    )
+
     chapters: list[Chapter] | None = None
     subtitles: Subtitles | None = None
     formats: Annotated[
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from media_dl.types import FORMAT_TYPE
 
 VIDEO_CODEC_RANK = {
@@ -20,6 +22,7 @@ AUDIO_CODEC_RANK = {
 }
 
 
+@lru_cache(maxsize=512)
 def get_codec_rank(
     codec: str | None,
     type: FORMAT_TYPE,
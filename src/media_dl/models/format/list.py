@@ -13,39 +13,8 @@ from media_dl.models.format.types import AudioFormat, Format, VideoFormat
 from media_dl.types import FORMAT_TYPE
 
 
-def format_sort(format: Format):
-    filesize = format.filesize or 0
-
-    if isinstance(format, VideoFormat):
-        is_video = 1
-
-        height = format.height
-        fps = format.fps or 0
-
-        vcodec = get_codec_rank(format.video_codec, "video")
-        acodec = get_codec_rank(format.audio_codec, "audio")
-
-        return (
-            is_video,
-            height,
-            fps,
-            vcodec,
-            acodec,
-            filesize,
-        )
-
-    elif isinstance(format, AudioFormat):
-        is_video = 0
-
-        bitrate = format.bitrate
-        acodec = get_codec_rank(format.codec, "audio")
-
-        return (
-            is_video,
-            acodec,
-            filesize,
-            bitrate,
-        )
+def format_sort(format: Format) -> tuple:
+    return format.rank
 
 
 FormatType = OnErrorOmit[VideoFormat | AudioFormat]
@@ -62,8 +31,22 @@ class FormatList(BaseList[FormatType], Generic[F]):
         codec: str | None = None,
         protocol: str | None = None,
     ) -> Self:
-        """Get filtered formats by options."""
+        """Get filtered formats by options. Results are cached per options."""
+
+        key = (extension, quality, codec, protocol)
+
+        if (view := self._views.get(key)) is None:
+            view = self._views[key] = self._filter(*key)
+
+        return view
 
+    def _filter(
+        self,
+        extension: str | None,
+        quality: int | None,
+        codec: str | None,
+        protocol: str | None,
+    ) -> Self:
         items = (f for f in self.root)
 
         if extension:
@@ -77,15 +60,37 @@ class FormatList(BaseList[FormatType], Generic[F]):
 
         return self.__class__(list(items))
 
+    @cached_property
+    def _views(self) -> dict[tuple, Self]:
+        return {}
+
     def only_video(self) -> FormatList[VideoFormat]:
-        return FormatList[VideoFormat](
-            [f for f in self.root if isinstance(f, VideoFormat)]
-        )
+        return self._partitions[0]
 
     def only_audio(self) -> FormatList[AudioFormat]:
-        return FormatList[AudioFormat](
-            [f for f in self.root if isinstance(f, AudioFormat)]
-        )
+        return self._partitions[1]
+
+    @cached_property
+    def _partitions(self) -> tuple[FormatList[VideoFormat], FormatList[AudioFormat]]:
+        """Video and audio formats, split in a single pass and kept in order."""
+
+        video: list[VideoFormat] = []
+        audio: list[AudioFormat] = []
+
+        for format in self.root:
+            if isinstance(format, VideoFormat):
+                video.append(format)
+            elif isinstance(format, AudioFormat):
+                audio.append(format)
+
+        return FormatList[VideoFormat](video), FormatList[AudioFormat](audio)
+
+    @cached_property
+    def _quality_index(self) -> tuple[list[F], list[int]]:
+        """Formats sorted by ascending quality, with their qualities to bisect."""
+
+        items = sorted(self.root, key=lambda f: f.quality)
+        return items, [f.quality for f in items]  # type: ignore
 
     @cached_property
     def type(self) -> FORMAT_TYPE:
@@ -111,7 +116,7 @@ class FormatList(BaseList[FormatType], Generic[F]):
         if attribute == "best":
             filter = format_sort
         elif attribute == "codec":
-            filter = lambda codec: get_codec_rank(codec, self.type)  # noqa: E731
+            filter = lambda f: get_codec_rank(f.codec, self.type)  # noqa: E731
         else:
             filter = lambda f: getattr(f, attribute)  # noqa: E731
 
@@ -131,14 +136,21 @@ class FormatList(BaseList[FormatType], Generic[F]):
         """
 
         try:
-            format = next(f for f in self if f.id == id)
-            return format
-        except StopIteration:
+            return self._ids[id]
+        except KeyError:
             raise IndexError(f"Format with id '{id}' has not been founded")
 
+    @cached_property
+    def _ids(self) -> dict[str, F]:
+        ids: dict[str, F] = {}
+
+        for format in self.root:
+            ids.setdefault(format.id, format)  # type: ignore
+
+        return ids
+
     def get_closest_quality(self, quality: int) -> F:
-        items = self.sort_by("quality", reverse=False)
-        qualities = [i.quality for i in items]
+        items, qualities = self._quality_index
         pos = bisect.bisect_left(qualities, quality)
 
         if pos == 0:
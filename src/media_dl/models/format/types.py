@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from functools import cached_property
 from pathlib import Path
 from typing import Annotated
 
@@ -13,9 +14,16 @@ from pydantic import (
 )
 
 from media_dl.models.base import Serializable
+from media_dl.models.format.codecs import get_codec_rank
 from media_dl.models.progress.format import FormatDownloadCallback, FormatState
+from media_dl.retry import RetryPolicy
 from media_dl.types import StrPath
 from media_dl.ydl.downloader import download_format
+from media_dl.ydl.segmented import (
+    RangeNotSupported,
+    download_segmented,
+    supports_segments,
+)
 from media_dl.ydl.types import SupportedExtensions, YDLFormatInfo
 
 Codec = Annotated[str, AfterValidator(lambda v: None if v == "none" else v)]
@@ -43,17 +51,46 @@ class Format(ABC, YDLArgs, Serializable):
         self,
         filepath: StrPath,
         on_progress: FormatDownloadCallback | None = None,
+        retry: RetryPolicy | None = None,
+        concurrent_fragments: int = 1,
+        connections: int = 1,
     ) -> Path:
-        state = FormatState()
+        """Download the format.
+
+        Args:
+            filepath: Path without extension where to save the file.
+            on_progress: Callback function to get progress information.
+            retry: How to retry failed requests.
+            concurrent_fragments: Fragments to download at the same time,
+                if the format protocol is fragmented (HLS/DASH).
+            connections: Connections to download byte ranges of large
+                HTTP formats. Fallback to a single one if ranges are not supported.
+
+        Returns:
+            Path to downloaded file.
+        """
+
+        state = FormatState(id=self.id)
+        format_info = self.to_ydl_dict()
+
+        def callback(data):
+            if on_progress:
+                state._ydl_progress(data, on_progress)
+
+        if supports_segments(format_info, connections):
+            try:
+                return download_segmented(
+                    filepath, format_info, connections, callback, retry
+                )
+            except RangeNotSupported:
+                state = FormatState(id=self.id)
+
         path = download_format(
             filepath,
-            format_info=self.to_ydl_dict(),
-            callback=lambda data: state._ydl_progress(
-                data,
-                on_progress,  # type: ignore
-            )
-            if on_progress
-            else None,
+            format_info=format_info,
+            callback=callback,
+            retry=retry,
+            concurrent_fragments=concurrent_fragments,
         )
         return path
 
@@ -72,6 +109,11 @@ class Format(ABC, YDLArgs, Serializable):
     def has_audio(self) -> bool:
         return bool(self.audio_codec)
 
+    @property
+    @abstractmethod
+    def rank(self) -> tuple:
+        """Key to sort formats from worst to best, computed once."""
+
     @field_serializer("audio_codec")
     def _serialize_acodec(self, value) -> str:
         if not value:
@@ -96,6 +138,15 @@ class AudioFormat(Format):
     def display_quality(self) -> str:
         return str(round(self.quality)) + "kbps"
 
+    @cached_property
+    def rank(self) -> tuple:
+        return (
+            0,
+            get_codec_rank(self.codec, "audio"),
+            self.filesize or 0,
+            self.bitrate,
+        )
+
     @model_serializer(mode="wrap")
     def _serialize_model(self, handler: SerializerFunctionWrapHandler):
         result: dict = handler(self)
@@ -128,6 +179,23 @@ class VideoFormat(Format):
     def display_quality(self) -> str:
         return str(self.quality) + "p"
 
+    @cached_property
+    def rank(self) -> tuple:
+        return (
+            1,
+            self.height,
+            self.fps or 0,
+            get_codec_rank(self.video_codec, "video"),
+            get_codec_rank(self.audio_codec, "audio"),
+            self.filesize or 0,
+        )
+
+    @field_serializer("video_codec")
+    def _serialize_vcodec(self, value) -> str:
+        if not value:
+            return "none"
+        return value
+
     @field_validator("extension")
     @classmethod
     def _validate_extension(cls, value) -> str:
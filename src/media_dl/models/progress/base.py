@@ -1,12 +1,13 @@
+from dataclasses import dataclass
 from pathlib import Path
 
-from pydantic import BaseModel
 
-
-class State(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class State:
     id: str
 
 
+@dataclass(slots=True, kw_only=True)
 class HasFile(State):
     filepath: Path
 
@@ -1,10 +1,16 @@
 from collections.abc import Callable
+from dataclasses import dataclass
 
-from pydantic import BaseModel
 from typing_extensions import Self
 
+from media_dl.models.progress.base import State
+
+
+@dataclass(slots=True, kw_only=True)
+class FormatState(State):
+    id: str = ""
+    """Format ID."""
 
-class FormatState(BaseModel):
     downloaded_bytes: float = 0
     total_bytes: float = 0
 
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
 from typing import Annotated, Literal
 
-from pydantic import Field
+from pydantic import Field, TypeAdapter
 
 from media_dl.models.content.media import LazyMedia, Media
 from media_dl.models.progress.base import HasFile, State
@@ -11,29 +14,43 @@ from media_dl.models.progress.format import FormatState
 from media_dl.models.progress.processor import ProcessingState
 
 
+@dataclass(slots=True, kw_only=True)
 class ResolvingState(State):
     status: Literal["resolving"] = "resolving"
     media: LazyMedia
 
 
+@dataclass(slots=True, kw_only=True)
 class ResolvedState(State):
     status: Literal["resolved"] = "resolved"
     media: Media
 
 
-class DownloadingState(FormatState, State):
+@dataclass(slots=True, kw_only=True)
+class DownloadingState(FormatState):
+    id: str
+    """Media ID."""
     status: Literal["downloading"] = "downloading"
 
 
+@dataclass(slots=True, kw_only=True)
 class ErrorState(State):
     status: Literal["error"] = "error"
     message: str
 
 
-class SkippedState(HasFile):
+@dataclass(slots=True, kw_only=True)
+class SkippedState(State):
     status: Literal["skipped"] = "skipped"
+    filepath: Path | None = None
+    """Existing file, unknown for archived medias without a recorded path."""
 
+    @property
+    def extension(self) -> str:
+        return self.filepath.suffix[1:] if self.filepath else ""
 
+
+@dataclass(slots=True, kw_only=True)
 class CompletedState(HasFile):
     status: Literal["completed"] = "completed"
 
@@ -51,3 +68,10 @@ MediaDownloadState = Annotated[
 
 
 MediaDownloadCallback = Callable[[MediaDownloadState], None]
+
+
+@cache
+def state_adapter() -> TypeAdapter[MediaDownloadState]:
+    """Pydantic adapter to validate and serialize progress states, like to JSON."""
+
+    return TypeAdapter(MediaDownloadState)
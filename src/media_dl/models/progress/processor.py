@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import Annotated, Literal
 
 from pydantic import Field
@@ -11,16 +12,19 @@ ProcessorStateType = Literal[
     "embed_metadata",
     "embed_thumbnail",
     "embed_subtitles",
+    "postprocess",
 ]
 ProcessorStateStage = Literal["started", "completed"]
 
 
+@dataclass(slots=True, kw_only=True)
 class ProcessorState(HasFile):
     status: Literal["processing"] = "processing"
     stage: ProcessorStateStage
     processor: ProcessorStateType
 
 
+@dataclass(slots=True, kw_only=True)
 class MergingProcessorState(ProcessorState):
     processor: Literal["merge_formats"] = "merge_formats"  # type: ignore
 
@@ -1,17 +1,37 @@
+import subprocess
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from media_dl.exceptions import ProcessingError
 from media_dl.models.content.media import Media
+from media_dl.models.content.metadata import Chapter
 from media_dl.models.format.types import Format
+from media_dl.path import get_ffmpeg, get_tempfile
 from media_dl.types import AUDIO_EXTENSION, EXTENSION, StrPath
 from media_dl.ydl.processor import (
     RequestedFormat,
     RequestedFormats,
     YDLProcessor,
 )
-from media_dl.ydl.types import YDLExtractInfo
+from media_dl.ydl.types import ThumbnailSupport, YDLExtractInfo
 
 FormatPaths = list[tuple[Format, Path]]
 
+SINGLE_PASS_CONTAINERS = frozenset(
+    {"mp4", "m4v", "mov", "mkv", "webm", "m4a", "mp3", "opus", "ogg", "flac", "mka"}
+)
+"""Containers which the `ProcessorPlan` can write by copying streams."""
+
+COVER_CONTAINERS = frozenset({"mp4", "m4v", "mov", "m4a", "mp3"})
+"""Containers which FFmpeg can write with an attached picture."""
+
+SUBTITLE_CODECS = {
+    "mp4": "mov_text",
+    "m4v": "mov_text",
+    "mov": "mov_text",
+    "mkv": "copy",
+}
+
 
 class MediaProcessor(YDLProcessor):
     def change_container(self, format: str | EXTENSION):
@@ -65,6 +85,224 @@ class MediaProcessor(YDLProcessor):
         return cls
 
 
+@dataclass(slots=True)
+class ProcessorPlan:
+    """Postprocessing operations to run in a single FFmpeg invocation.
+
+    Streams are copied, so formats are merged, the container is changed and
+    subtitles, cover and metadata are embedded while writing the file only once.
+
+    Args:
+        filepath: Output file. Its extension determines the container.
+        video: Video file (or file with both video and audio) to include.
+        audio: Audio file to include.
+    """
+
+    filepath: Path
+    video: Path | None = None
+    audio: Path | None = None
+    subtitles: list[Path] = field(default_factory=list)
+    thumbnail: Path | None = None
+    square_thumbnail: bool = False
+    metadata: dict[str, str] = field(default_factory=dict)
+    chapters: list[Chapter] = field(default_factory=list)
+
+    @property
+    def extension(self) -> str:
+        return self.filepath.suffix[1:]
+
+    @staticmethod
+    def supports(extension: str) -> bool:
+        return extension in SINGLE_PASS_CONTAINERS
+
+    @property
+    def operations(self) -> list[str]:
+        """Name of the operations done by the plan."""
+
+        operations = ["merge_formats" if self.video and self.audio else "remux"]
+
+        if self.subtitles and self.extension in SUBTITLE_CODECS:
+            operations.append("embed_subtitles")
+        if self.thumbnail:
+            operations.append("embed_thumbnail")
+        if self.metadata or self.chapters:
+            operations.append("embed_metadata")
+
+        return operations
+
+    def args(self, metadata_file: Path | None = None) -> list[str]:
+        """Build FFmpeg arguments (without executable)."""
+
+        inputs: list[Path] = []
+        maps: list[str] = []
+        options: list[str] = []
+
+        if self.video:
+            inputs.append(self.video)
+            maps += ["-map", "0:v:0"]
+
+            if self.audio:
+                inputs.append(self.audio)
+                maps += ["-map", "1:a:0"]
+            else:
+                maps += ["-map", "0:a?"]
+        elif self.audio:
+            inputs.append(self.audio)
+            maps += ["-map", "0:a:0"]
+        else:
+            raise ValueError("A video or audio file is required.")
+
+        if codec := SUBTITLE_CODECS.get(self.extension):
+            for index, subtitle in enumerate(self.subtitles):
+                maps += ["-map", str(len(inputs))]
+                options += [
+                    f"-metadata:s:s:{index}",
+                    f"language={subtitle.suffixes[0][1:]}",
+                ]
+                inputs.append(subtitle)
+
+            if self.subtitles:
+                options += ["-c:s", codec]
+
+        if self.thumbnail and self.extension in COVER_CONTAINERS:
+            cover = 1 if self.video else 0
+            maps += ["-map", str(len(inputs))]
+            options += [
+                f"-c:v:{cover}",
+                "mjpeg",
+                f"-disposition:v:{cover}",
+                "attached_pic",
+            ]
+
+            if self.square_thumbnail:
+                options += [f"-filter:v:{cover}", "crop=ih"]
+
+            if self.extension == "mp3":
+                options += [
+                    "-id3v2_version",
+                    "3",
+                    f"-metadata:s:v:{cover}",
+                    "title=Album cover",
+                    f"-metadata:s:v:{cover}",
+                    "comment=Cover (front)",
+                ]
+
+            inputs.append(self.thumbnail)
+
+        if metadata_file:
+            options += [
+                "-map_metadata",
+                str(len(inputs)),
+                "-map_chapters",
+                str(len(inputs)),
+            ]
+
+        args = ["-y", "-loglevel", "error"]
+
+        for path in inputs:
+            args += ["-i", str(path)]
+
+        if metadata_file:
+            args += ["-f", "ffmetadata", "-i", str(metadata_file)]
+
+        return args + maps + ["-dn", "-c", "copy"] + options + [str(self.filepath)]
+
+    def run(self, ffmpeg_path: StrPath | None = None) -> MediaProcessor:
+        """Execute the plan.
+
+        If the container can't hold an attached picture, the thumbnail is embedded
+        in a second step.
+
+        Raises:
+            ProcessingError: FFmpeg failed or is not installed.
+        """
+
+        ffmpeg = get_ffmpeg(ffmpeg_path)
+        if not ffmpeg:
+            raise ProcessingError("FFmpeg is needed for use postprocessors.")
+
+        metadata_file = None
+
+        if self.metadata or self.chapters:
+            metadata_file = get_tempfile()
+            metadata_file.write_text(
+                _ffmetadata(self.metadata, self.chapters),
+                encoding="utf-8",
+            )
+
+        try:
+            process = subprocess.run(
+                [str(ffmpeg), *self.args(metadata_file)],
+                capture_output=True,
+                check=False,
+                text=True,
+                errors="replace",
+            )
+        finally:
+            if metadata_file:
+                metadata_file.unlink(missing_ok=True)
+
+        if process.returncode != 0:
+            lines = process.stderr.strip().splitlines()
+            raise ProcessingError(lines[-1] if lines else "FFmpeg failed.")
+
+        prc = MediaProcessor(self.filepath, ffmpeg)
+
+        if (
+            self.thumbnail
+            and self.extension not in COVER_CONTAINERS
+            and self.extension in ThumbnailSupport
+        ):
+            prc.embed_thumbnail(self.thumbnail, square=self.square_thumbnail)
+
+        return prc
+
+
+def media_tags(media: Media, include_music: bool = False) -> dict[str, str]:
+    """Get FFmpeg metadata tags of a `Media`."""
+
+    tags = {
+        "title": media.title,
+        "artist": media.uploader,
+        "date": media.datetime.strftime("%Y%m%d") if media.datetime else "",
+        "description": media.description or "",
+        "synopsis": media.description or "",
+        "comment": media.url,
+        "purl": media.url,
+        "album": media.album,
+        "album_artist": media.album_artist,
+        "genre": ", ".join(media.genres) if media.genres else "",
+    }
+
+    if include_music:
+        for key, value in _media_to_music_metadata(media).items():
+            tags[key.removeprefix("meta_")] = value
+
+    return {key: value for key, value in tags.items() if value}
+
+
+def _ffmetadata(tags: dict[str, str], chapters: list[Chapter]) -> str:
+    lines = [";FFMETADATA1"]
+    lines += [f"{key}={_escape_ffmetadata(value)}" for key, value in tags.items()]
+
+    for chapter in chapters:
+        lines += [
+            "[CHAPTER]",
+            "TIMEBASE=1/1000",
+            f"START={chapter.start_time * 1000}",
+            f"END={chapter.end_time * 1000}",
+            f"title={_escape_ffmetadata(chapter.title)}",
+        ]
+
+    return "\n".join(lines) + "\n"
+
+
+def _escape_ffmetadata(value: str) -> str:
+    for char in ("\\", "=", ";", "#", "\n"):
+        value = value.replace(char, "\\" + char)
+    return value
+
+
 def _media_to_music_metadata(media: Media) -> YDLExtractInfo:
     return {
         "meta_track": media.track or media.title,
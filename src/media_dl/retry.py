@@ -0,0 +1,59 @@
+"""Retry policy for transient network errors."""
+
+import random
+from dataclasses import dataclass
+
+from media_dl.ydl.types import YDLParams
+
+
+@dataclass(slots=True, frozen=True)
+class RetryPolicy:
+    """How many times and how long to wait before retrying a failed operation.
+
+    Delays grow exponentially from `backoff` up to `max_backoff`, reduced by a
+    random `jitter` fraction so parallel transfers don't retry at once.
+
+    Args:
+        attempts: Maximum tries of a media download, including the first one.
+        fragment_retries: Maximum retries of each file or fragment request.
+        backoff: Seconds to wait after the first failure.
+        max_backoff: Maximum seconds to wait between retries.
+        jitter: Fraction of the delay which is randomized.
+        final_pass: Retry failed medias once more at the end of a batch.
+    """
+
+    attempts: int = 3
+    fragment_retries: int = 10
+    backoff: float = 1.0
+    max_backoff: float = 60.0
+    jitter: float = 0.5
+    final_pass: bool = True
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Seconds to wait before retry.
+
+        Args:
+            attempt: Number of failed tries, starting from 0.
+            retry_after: Delay requested by the server, preferred when provided.
+        """
+
+        if retry_after is not None:
+            return min(max(retry_after, 0), self.max_backoff)
+
+        delay = min(self.backoff * 2**attempt, self.max_backoff)
+        return delay * (1 - random.uniform(0, self.jitter))
+
+    def ydl_params(self) -> YDLParams:
+        """YT-DLP params to retry requests inside a single transfer."""
+
+        return {
+            "retries": self.fragment_retries,
+            "fragment_retries": self.fragment_retries,
+            "retry_sleep_functions": {
+                "http": lambda n: self.delay(n),
+                "fragment": lambda n: self.delay(n),
+            },
+        }
+
+
+NO_RETRY = RetryPolicy(attempts=1, fragment_retries=0, final_pass=False)
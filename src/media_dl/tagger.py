@@ -0,0 +1,190 @@
+"""In-place audio tagging with Mutagen."""
+
+import base64
+from pathlib import Path
+
+import mutagen
+from mutagen.flac import FLAC, Picture
+from mutagen.id3 import APIC, COMM, TALB, TCON, TDRC, TIT2, TPE1, TPE2, TXXX, WXXX
+from mutagen.mp3 import MP3
+from mutagen.mp4 import MP4, MP4Cover
+from mutagen.ogg import OggFileType
+from typing_extensions import Self
+
+from media_dl.exceptions import ProcessingError
+from media_dl.types import StrPath
+
+TAGGING_CONTAINERS = frozenset({"m4a", "mp3", "opus", "ogg", "flac"})
+"""Containers which tags and cover can be written without remuxing."""
+
+MP4_TAGS = {
+    "title": "\xa9nam",
+    "artist": "\xa9ART",
+    "date": "\xa9day",
+    "description": "desc",
+    "comment": "\xa9cmt",
+    "album": "\xa9alb",
+    "album_artist": "aART",
+    "genre": "\xa9gen",
+}
+VORBIS_TAGS = {
+    "title": "title",
+    "artist": "artist",
+    "date": "date",
+    "description": "description",
+    "comment": "comment",
+    "album": "album",
+    "album_artist": "albumartist",
+    "genre": "genre",
+}
+ID3_TAGS = {
+    "title": TIT2,
+    "artist": TPE1,
+    "date": TDRC,
+    "album": TALB,
+    "album_artist": TPE2,
+    "genre": TCON,
+}
+
+
+class MediaTagger:
+    """Embed metadata and cover in an audio file, editing it in place.
+
+    Args:
+        filepath: Audio file with a supported extension.
+
+    Raises:
+        ProcessingError: File can't be read by Mutagen.
+    """
+
+    def __init__(self, filepath: StrPath):
+        self.filepath = Path(filepath)
+
+        if not self.supports(self.extension):
+            raise ValueError(f'"{self.filepath}" is not a taggable audio file.')
+
+        try:
+            file = mutagen.File(self.filepath)
+        except mutagen.MutagenError as err:
+            raise ProcessingError(str(err))
+
+        if file is None:
+            raise ProcessingError(f'Unable to read tags of "{self.filepath}".')
+        if file.tags is None:
+            file.add_tags()
+
+        self._file = file
+
+    @property
+    def extension(self) -> str:
+        return self.filepath.suffix[1:]
+
+    @staticmethod
+    def supports(extension: str) -> bool:
+        return extension in TAGGING_CONTAINERS
+
+    @staticmethod
+    def image_mime(filepath: StrPath) -> str | None:
+        """Get MIME type of a JPEG or PNG image, the only ones allowed as cover."""
+
+        with open(filepath, "rb") as f:
+            header = f.read(8)
+
+        if header.startswith(b"\xff\xd8\xff"):
+            return "image/jpeg"
+        elif header.startswith(b"\x89PNG\r\n\x1a\n"):
+            return "image/png"
+        else:
+            return None
+
+    def embed_metadata(self, tags: dict[str, str]) -> Self:
+        """Write tags in the file. Use `save` to persist changes.
+
+        Args:
+            tags: Same tags generated by `media_dl.processor.media_tags`.
+        """
+
+        file = self._file
+
+        if "date" in tags:
+            tags = tags | {"date": _iso_date(tags["date"])}
+
+        if isinstance(file, MP4):
+            for key, value in tags.items():
+                if name := MP4_TAGS.get(key):
+                    file.tags[name] = [value]  # type: ignore
+        elif isinstance(file, MP3):
+            for key, value in tags.items():
+                if frame := ID3_TAGS.get(key):
+                    file.tags.setall(frame.__name__, [frame(encoding=3, text=value)])  # type: ignore
+
+            if comment := tags.get("comment"):
+                file.tags.setall("COMM", [COMM(encoding=3, text=comment)])  # type: ignore
+            if description := tags.get("description"):
+                file.tags.setall(  # type: ignore
+                    "TXXX:description",
+                    [TXXX(encoding=3, desc="description", text=description)],
+                )
+            if url := tags.get("purl"):
+                file.tags.setall("WXXX", [WXXX(encoding=3, url=url)])  # type: ignore
+        else:
+            for key, value in tags.items():
+                if name := VORBIS_TAGS.get(key):
+                    file.tags[name] = [value]  # type: ignore
+
+        return self
+
+    def embed_thumbnail(self, thumbnail: StrPath) -> Self:
+        """Write cover in the file. Use `save` to persist changes.
+
+        Raises:
+            ValueError: Image is not JPEG or PNG.
+        """
+
+        mime = self.image_mime(thumbnail)
+
+        if not mime:
+            raise ValueError(f'"{thumbnail}" must be a JPEG or PNG image.')
+
+        data = Path(thumbnail).read_bytes()
+        file = self._file
+
+        if isinstance(file, MP4):
+            format = (
+                MP4Cover.FORMAT_JPEG if mime == "image/jpeg" else MP4Cover.FORMAT_PNG
+            )
+            file.tags["covr"] = [MP4Cover(data, imageformat=format)]  # type: ignore
+        elif isinstance(file, MP3):
+            file.tags.setall(  # type: ignore
+                "APIC",
+                [APIC(encoding=3, mime=mime, type=3, desc="Cover (front)", data=data)],
+            )
+        else:
+            picture = Picture()
+            picture.type = 3
+            picture.mime = mime
+            picture.data = data
+
+            if isinstance(file, FLAC):
+                file.clear_pictures()
+                file.add_picture(picture)
+            elif isinstance(file, OggFileType):
+                file.tags["metadata_block_picture"] = [  # type: ignore
+                    base64.b64encode(picture.write()).decode("ascii")
+                ]
+
+        return self
+
+    def save(self) -> None:
+        try:
+            self._file.save()
+        except mutagen.MutagenError as err:
+            raise ProcessingError(str(err))
+
+
+def _iso_date(value: str) -> str:
+    """Convert `YYYYMMDD` date to ISO format."""
+
+    if len(value) == 8 and value.isdigit():
+        return f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    return value
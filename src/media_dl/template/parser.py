@@ -1,8 +1,10 @@
-import re
+from functools import lru_cache
 from pathlib import Path
+from string import Formatter
 from typing import Literal
 
 from pathvalidate import sanitize_filepath
+from pydantic import BaseModel
 
 from media_dl.exceptions import OutputTemplateError
 from media_dl.models.content.list import Playlist
@@ -12,35 +14,98 @@ from media_dl.template.keys import OUTPUT_TEMPLATES
 from media_dl.types import StrPath
 
 
+class OutputTemplate:
+    """Output template parsed and validated once.
+
+    Only the referenced keys are serialized from each media, instead of
+    dumping the full models.
+
+    Raises:
+        OutputTemplateError: Template has invalid keys or syntax.
+    """
+
+    def __init__(self, template: StrPath):
+        self.template = str(template)
+
+        try:
+            self.keys = frozenset(
+                field
+                for _, field, _, _ in Formatter().parse(self.template)
+                if field is not None
+            )
+        except ValueError as e:
+            raise OutputTemplateError(f"Template '{self.template}' is invalid: {e}.")
+
+        for key in self.keys:
+            if key not in OUTPUT_TEMPLATES:
+                raise OutputTemplateError(
+                    f"Key '{{{key}}}' from '{self.template}' is invalid."
+                )
+
+    def generate(
+        self,
+        media: Media,
+        playlist: Playlist | None = None,
+        format: Format | None = None,
+    ) -> Path:
+        data = {}
+
+        # Same precedence than the full dumps: media > playlist > format.
+        if format:
+            data |= self._dump(format)
+            data |= self._dump(format, by_alias=True)
+        if playlist:
+            data |= self._dump(playlist, by_alias=True)
+        if media:
+            data |= self._dump(media)
+
+        template = self.template.format(**data)
+        path = Path(sanitize_filepath(template, max_len=250))
+        return path
+
+    def _dump(self, model: BaseModel, by_alias: bool = False) -> dict:
+        if not self.keys:
+            return {}
+
+        fields = _template_fields(type(model), self.keys, by_alias)
+        return model.model_dump(include=fields, by_alias=by_alias) if fields else {}
+
+
+@lru_cache(maxsize=64)
+def _template_fields(
+    model: type[BaseModel],
+    keys: frozenset[str],
+    by_alias: bool,
+) -> frozenset[str]:
+    """Fields of a model which are dumped with one of the keys."""
+
+    fields = set()
+
+    for name, info in model.model_fields.items():
+        key = (info.serialization_alias or info.alias or name) if by_alias else name
+
+        if key in keys:
+            fields.add(name)
+
+    return frozenset(fields)
+
+
+@lru_cache(maxsize=32)
+def compile_output(output: str) -> OutputTemplate:
+    """Get a cached `OutputTemplate`."""
+
+    return OutputTemplate(output)
+
+
 def generate_output_template(
     output: StrPath,
     media: Media,
     playlist: Playlist | None = None,
     format: Format | None = None,
 ) -> Path:
-    validate_output(output)
-
-    data = {}
-
-    if format:
-        data |= format.model_dump()
-        data |= format.model_dump(by_alias=True)
-    if playlist:
-        data |= playlist.model_dump(by_alias=True)
-    if media:
-        data |= media.model_dump()
-
-    template = str(output).format(**data)
-    path = Path(sanitize_filepath(template, max_len=250))
-    return path
+    return compile_output(str(output)).generate(media, playlist, format)
 
 
 def validate_output(output: StrPath) -> Literal[True]:
-    pattern = r"{(.*?)}"
-    keys: list[str] = re.findall(pattern, str(output))
-
-    for key in keys:
-        if key not in OUTPUT_TEMPLATES:
-            raise OutputTemplateError(f"Key '{{{key}}}' from '{output}' is invalid.")
-
+    compile_output(str(output))
     return True
@@ -4,22 +4,47 @@ from pathlib import Path
 from yt_dlp.utils import DownloadError as YDLDownloadError
 
 from media_dl.exceptions import DownloadError
+from media_dl.retry import RetryPolicy
 from media_dl.types import StrPath
-from media_dl.ydl.messages import format_except_message
+from media_dl.ydl.messages import convert_exception
 from media_dl.ydl.types import YDLExtractInfo, YDLFormatInfo, YDLParams
-from media_dl.ydl.wrapper import YDL
+from media_dl.ydl.wrapper import shared_ydl
+
+
+FRAGMENTED_PROTOCOLS = frozenset(
+    {
+        "m3u8",
+        "m3u8_native",
+        "http_dash_segments",
+        "http_dash_segments_generator",
+        "ism",
+        "f4m",
+    }
+)
+
+
+def is_fragmented(format_info: YDLFormatInfo) -> bool:
+    """Check if a format is downloaded in fragments (HLS/DASH)."""
+
+    return format_info.get("protocol") in FRAGMENTED_PROTOCOLS or bool(
+        format_info.get("fragments")
+    )
 
 
 def download_format(
     filepath: StrPath,
     format_info: YDLFormatInfo,
     callback: Callable[[dict[str, str | int]], None] | None = None,
+    retry: RetryPolicy | None = None,
+    concurrent_fragments: int = 1,
 ) -> Path:
     filepath = Path(filepath)
-    params = {}
+    params: YDLParams = {"concurrent_fragment_downloads": concurrent_fragments}
 
     if callback:
         params |= {"progress_hooks": [callback]}
+    if retry:
+        params |= retry.ydl_params()
 
     params |= {"outtmpl": f"{filepath}.%(ext)s"}
     info = {
@@ -38,22 +63,20 @@ def download_from_info(info: YDLExtractInfo, params: YDLParams) -> Path:
     retries: YDLParams = {"retries": 0, "fragment_retries": 0}
 
     try:
-        result = YDL(
-            params=retries | params,
-            auto_init=True,
-        ).process_ie_result(
-            info,  # type: ignore
-            download=True,
-        )
+        with shared_ydl(retries | params) as ydl:
+            result = ydl.process_ie_result(
+                info,  # type: ignore
+                download=True,
+            )
+
         filepath = result["requested_downloads"][0]["filepath"]  # type: ignore
         return Path(filepath)
     except YDLDownloadError as err:
-        msg = format_except_message(err)
-        raise DownloadError(msg)
+        raise convert_exception(err, DownloadError)
 
 
 def download_thumbnail(filepath: StrPath, info: YDLExtractInfo) -> Path:
-    ydl = YDL(
+    with shared_ydl(
         {
             "writethumbnail": True,
             "outtmpl": {
@@ -61,13 +84,12 @@ def download_thumbnail(filepath: StrPath, info: YDLExtractInfo) -> Path:
                 "pl_thumbnail": "",
             },
         }
-    )
-
-    final = ydl._write_thumbnails(  # type: ignore
-        label=filepath,
-        info_dict=info,
-        filename=str(filepath),
-    )
+    ) as ydl:
+        final = ydl._write_thumbnails(  # type: ignore
+            label=filepath,
+            info_dict=info,
+            filename=str(filepath),
+        )
 
     if final:
         return Path(final[0][0])
@@ -76,19 +98,18 @@ def download_thumbnail(filepath: StrPath, info: YDLExtractInfo) -> Path:
 
 
 def download_subtitles(filepath: StrPath, info: YDLExtractInfo) -> list[Path]:
-    ydl = YDL({"writesubtitles": True, "allsubtitles": True})
-
-    subs = ydl.process_subtitles(
-        str(filepath),
-        info.get("subtitles", {}),
-        info.get("automatic_captions", {}),
-    )
-    info |= {"requested_subtitles": subs}  # type: ignore
+    with shared_ydl({"writesubtitles": True, "allsubtitles": True}) as ydl:
+        subs = ydl.process_subtitles(
+            str(filepath),
+            info.get("subtitles", {}),
+            info.get("automatic_captions", {}),
+        )
+        info |= {"requested_subtitles": subs}  # type: ignore
 
-    final: list[tuple[str, str]] = ydl._write_subtitles(  # type: ignore
-        info_dict=info,
-        filename=str(filepath),
-    )
+        final: list[tuple[str, str]] = ydl._write_subtitles(  # type: ignore
+            info_dict=info,
+            filename=str(filepath),
+        )
 
     if final:
         result = [Path(entry[0]) for entry in final]
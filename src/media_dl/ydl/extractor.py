@@ -1,16 +1,18 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from typing import cast
 
 from yt_dlp.networking.exceptions import RequestError
 from yt_dlp.utils import DownloadError as YDLDownloadError
+from yt_dlp.utils import ExtractorError
 
 from media_dl.exceptions import ExtractError
 from media_dl.types import SEARCH_SERVICE
-from media_dl.ydl.messages import format_except_message
+from media_dl.ydl.messages import convert_exception
 from media_dl.ydl.types import YDLExtractInfo
-from media_dl.ydl.wrapper import YDL
+from media_dl.ydl.wrapper import YDL, shared_ydl
 
 
 @dataclass(slots=True)
@@ -22,6 +24,8 @@ class SearchQuery:
         return self.template.format(limit=limit) + query
 
 
+MAX_REDIRECTS = 5
+
 SEARCH_QUERIES = [
     SearchQuery("soundcloud", "scsearch{limit}:"),
     SearchQuery("youtube", "ytsearch{limit}:"),
@@ -47,17 +51,15 @@ def extract_query(
 
 def extract_info(query: str) -> YDLExtractInfo:
     try:
-        ydl = YDL(
-            params={
+        with shared_ydl(
+            {
                 "extract_flat": "in_playlist",
                 "skip_download": True,
-            },
-            auto_init=True,
-        )
-        info = ydl.extract_info(query, download=False)
+            }
+        ) as ydl:
+            info = ydl.extract_info(query, download=False)
     except (YDLDownloadError, RequestError) as err:
-        msg = format_except_message(err)
-        raise ExtractError(msg)
+        raise convert_exception(err, ExtractError)
 
     # Some extractors need redirect to "real URL" (Example: Pinterest)
     # In this case, we need do another request.
@@ -66,3 +68,43 @@ def extract_info(query: str) -> YDLExtractInfo:
             return extract_info(url)
 
     return cast(YDLExtractInfo, info)
+
+
+def extract_info_lazy(query: str) -> YDLExtractInfo:
+    """Extract info without processing playlist entries.
+
+    For playlists, `entries` is kept as the lazy iterable returned by the
+    extractor, so pages are only requested while iterating it.
+    """
+
+    try:
+        # Entries are fetched later, maybe from other threads, so it can't be shared.
+        ydl = YDL(params={"extract_flat": "in_playlist"}, auto_init=True)
+        info = ydl.extract_info(query, download=False, process=False)
+
+        # Follow redirects to the real extractor (Example: Channel -> Videos tab)
+        for _ in range(MAX_REDIRECTS):
+            if not (info and info.get("_type") in ("url", "url_transparent")):
+                break
+
+            info = ydl.extract_info(
+                info["url"],
+                download=False,
+                ie_key=info.get("ie_key"),
+                process=False,
+            )
+    except (YDLDownloadError, RequestError) as err:
+        raise convert_exception(err, ExtractError)
+
+    return cast(YDLExtractInfo, info)
+
+
+def iter_entries(entries: Iterable[YDLExtractInfo]) -> Iterator[YDLExtractInfo]:
+    """Iterate lazy playlist entries, converting errors raised while paginating."""
+
+    try:
+        for entry in entries:
+            if entry:
+                yield entry
+    except (YDLDownloadError, ExtractorError, RequestError) as err:
+        raise convert_exception(err, ExtractError)
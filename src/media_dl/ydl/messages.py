@@ -1,27 +1,41 @@
+import time
 from collections.abc import Callable
-from typing import NamedTuple
+from email.utils import parsedate_to_datetime
+from typing import NamedTuple, TypeVar
+
+from media_dl.exceptions import MediaError
+
+E = TypeVar("E", bound=MediaError)
+
+RETRYABLE_HTTP_CODES = ("408", "425", "429", "500", "502", "503", "504")
 
 
 class ExceptMsg(NamedTuple):
     matchs: list[str]
     text: str | Callable[[str], str]
+    retryable: bool | Callable[[str], bool] = False
 
 
 MESSAGES: list[ExceptMsg] = [
     ExceptMsg(
         matchs=["HTTP Error"],
-        text=lambda v: v
-        + " : You may have exceeded the page request limit, received an IP block, among others. Please try again later.",
+        text=lambda v: (
+            v
+            + " : You may have exceeded the page request limit, received an IP block, among others. Please try again later."
+        ),
+        retryable=lambda v: any(f"HTTP Error {c}" in v for c in RETRYABLE_HTTP_CODES),
     ),
     ExceptMsg(
         matchs=["Read timed out"],
         text="Read timed out.",
+        retryable=True,
     ),
     ExceptMsg(
         matchs=["Unable to download webpage"],
-        text=lambda v: "Invalid URL."
-        if any(s in v for s in ("[Errno -2]", "[Errno -5]"))
-        else v,
+        text=lambda v: (
+            "Invalid URL." if any(s in v for s in ("[Errno -2]", "[Errno -5]")) else v
+        ),
+        retryable=lambda v: not any(s in v for s in ("[Errno -2]", "[Errno -5]")),
     ),
     ExceptMsg(
         matchs=["is not a valid URL"],
@@ -54,6 +68,7 @@ MESSAGES: list[ExceptMsg] = [
     ExceptMsg(
         matchs=["Unable to download", "Got error"],
         text="Unable to download.",
+        retryable=True,
     ),
     ExceptMsg(
         matchs=["is only available for registered users"],
@@ -65,17 +80,82 @@ MESSAGES: list[ExceptMsg] = [
 def format_except_message(exception: Exception) -> str:
     """Get a user friendly message of a YT-DLP message exception."""
 
-    message: str = str(exception)
+    message = _raw_message(exception)
+
+    if item := _match_message(message):
+        if callable(item.text):
+            message = item.text(message)
+        else:
+            message = item.text
+
+    return message
+
+
+def is_retryable(exception: Exception) -> bool:
+    """Check if a YT-DLP exception is caused by a transient error."""
+
+    message = _raw_message(exception)
+
+    if item := _match_message(message):
+        if callable(item.retryable):
+            return item.retryable(message)
+        return item.retryable
+
+    return False
+
+
+def get_retry_after(exception: Exception) -> float | None:
+    """Get seconds of the `Retry-After` header of a YT-DLP HTTP exception."""
 
-    if message.startswith("ERROR: "):
-        message = message.strip("ERROR: ")
+    error: BaseException | None = exception
+    seen = set()
 
+    # YT-DLP keeps the original error in `exc_info` or `cause`.
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+
+        if value := headers.get("Retry-After"):
+            try:
+                return float(value)
+            except ValueError:
+                pass
+
+            try:
+                return parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+
+        exc_info = getattr(error, "exc_info", None)
+        error = (
+            (exc_info[1] if exc_info else None)
+            or getattr(error, "cause", None)
+            or error.__cause__
+            or error.__context__
+        )
+
+    return None
+
+
+def convert_exception(exception: Exception, cls: type[E]) -> E:
+    """Convert a YT-DLP exception with a user friendly message and retry info."""
+
+    return cls(
+        format_except_message(exception),
+        retryable=is_retryable(exception),
+        retry_after=get_retry_after(exception),
+    )
+
+
+def _raw_message(exception: Exception) -> str:
+    return str(exception).removeprefix("ERROR: ")
+
+
+def _match_message(message: str) -> ExceptMsg | None:
     for item in MESSAGES:
         if any(s in message for s in item.matchs):
-            if callable(item.text):
-                message = item.text(message)
-            else:
-                message = item.text
-            break
+            return item
 
-    return message
+    return None
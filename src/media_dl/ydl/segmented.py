@@ -0,0 +1,278 @@
+"""Download a file over several connections, each one fetching a byte range."""
+
+import concurrent.futures as cf
+import itertools
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from yt_dlp.networking import Request
+from yt_dlp.networking.exceptions import RequestError
+
+from media_dl.exceptions import DownloadError
+from media_dl.retry import NO_RETRY, RetryPolicy
+from media_dl.types import StrPath
+from media_dl.ydl.messages import convert_exception
+from media_dl.ydl.types import YDLFormatInfo
+from media_dl.ydl.wrapper import shared_ydl
+
+SEGMENTED_PROTOCOLS = frozenset({"http", "https"})
+MIN_SEGMENT_SIZE = 4 * 1024**2
+CHUNK_SIZE = 1024**2
+SEGMENT_WORKERS = 32
+"""Threads shared by the segments of every file."""
+
+
+class RangeNotSupported(Exception):
+    """Server doesn't honor `Range` requests."""
+
+
+def supports_segments(format_info: YDLFormatInfo, connections: int) -> bool:
+    """Check if a format is worth to download in segments."""
+
+    filesize = format_info.get("filesize") or 0
+
+    return (
+        connections > 1
+        and format_info.get("protocol") in SEGMENTED_PROTOCOLS
+        and filesize >= MIN_SEGMENT_SIZE * 2
+        and not format_info.get("cookies")
+    )
+
+
+def download_segmented(
+    filepath: StrPath,
+    format_info: YDLFormatInfo,
+    connections: int,
+    callback: Callable[[dict], None] | None = None,
+    retry: RetryPolicy | None = None,
+) -> Path:
+    """Download a progressive format in byte ranges, written in place.
+
+    The file is preallocated and every connection writes its range at its
+    offset, so no concatenation is needed after download. Progress of each
+    range is kept next to the partial file, so an interrupted download
+    continues where it stopped.
+
+    Raises:
+        RangeNotSupported: Server doesn't return partial content.
+        DownloadError: Some segment failed.
+    """
+
+    url: str = format_info["url"]
+    size: int = format_info["filesize"]  # type: ignore
+    headers: dict[str, str] = format_info.get("http_headers") or {}
+    retry = retry or NO_RETRY
+
+    final = Path(f"{filepath}.{format_info['ext']}")
+    # Not named ".part", YT-DLP would take a preallocated file as complete.
+    part = final.with_name(final.name + ".segments")
+    state_file = final.with_name(final.name + ".ranges")
+
+    # Completed by a previous run.
+    if final.is_file() and final.stat().st_size == size:
+        if callback:
+            callback(
+                {"status": "downloading", "downloaded_bytes": size, "total_bytes": size}
+            )
+            callback({"status": "finished"})
+        return final
+
+    ranges = _load_ranges(state_file, part, size)
+
+    if ranges is None:
+        _check_range(url, headers, size)
+
+        count = min(connections, size // MIN_SEGMENT_SIZE)
+        step = -(-size // count)
+        ranges = [
+            [start, start, min(start + step, size) - 1]
+            for start in range(0, size, step)
+        ]
+
+    lock = threading.Lock()
+    cancel = threading.Event()
+    started = time.monotonic()
+    downloaded = sum(offset - start for start, offset, _ in ranges)
+    resumed = downloaded
+
+    def _progress(segment: list[int], amount: int):
+        nonlocal downloaded
+
+        with lock:
+            segment[1] += amount
+            downloaded += amount
+            current = downloaded
+
+        if callback:
+            elapsed = time.monotonic() - started
+            callback(
+                {
+                    "status": "downloading",
+                    "downloaded_bytes": current,
+                    "total_bytes": size,
+                    "elapsed": elapsed,
+                    "speed": (current - resumed) / elapsed if elapsed else 0,
+                }
+            )
+
+    def _segment(fd: int, segment: list[int]):
+        for attempt in itertools.count():
+            try:
+                return _fetch(fd, segment)
+            except (RequestError, DownloadError) as err:
+                if cancel.is_set() or attempt >= retry.fragment_retries:
+                    raise
+                if isinstance(err, DownloadError) and not err.retryable:
+                    raise
+
+                cancel.wait(retry.delay(attempt))
+
+    def _fetch(fd: int, segment: list[int]):
+        _, offset, end = segment
+
+        if offset > end:
+            return
+
+        request = Request(url, headers=headers | {"Range": f"bytes={offset}-{end}"})
+
+        with shared_ydl() as ydl:
+            response = ydl.urlopen(request)
+
+            try:
+                if response.status != 206:
+                    raise RangeNotSupported(url)
+
+                while offset <= end and not cancel.is_set():
+                    chunk = response.read(min(CHUNK_SIZE, end - offset + 1))
+
+                    if not chunk:
+                        break
+
+                    _write(fd, chunk, offset)
+                    offset += len(chunk)
+                    _progress(segment, len(chunk))
+            finally:
+                response.close()
+
+        if offset <= end and not cancel.is_set():
+            raise DownloadError(
+                f"Segment {segment[0]}-{end} ended early.",
+                retryable=True,
+            )
+
+    flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    fd = os.open(part, flags, 0o644)
+
+    try:
+        os.ftruncate(fd, size)
+
+        futures = [_segment_pool().submit(_segment, fd, r) for r in ranges]
+
+        try:
+            for future in cf.as_completed(futures):
+                future.result()
+        except BaseException:
+            cancel.set()
+
+            # File descriptor must outlive every segment.
+            cf.wait(futures)
+            raise
+    except BaseException as err:
+        os.close(fd)
+
+        # Written ranges are kept, to continue them on next try.
+        with lock:
+            _save_ranges(state_file, size, ranges)
+
+        if isinstance(err, RequestError):
+            raise convert_exception(err, DownloadError)
+        raise
+
+    os.close(fd)
+    os.replace(part, final)
+    state_file.unlink(missing_ok=True)
+
+    if callback:
+        callback({"status": "finished"})
+
+    return final
+
+
+def _load_ranges(state_file: Path, part: Path, size: int) -> list[list[int]] | None:
+    """Ranges as `[start, offset, end]` of an interrupted download, if any."""
+
+    try:
+        data = json.loads(state_file.read_text())
+
+        if data["size"] != size or part.stat().st_size != size:
+            return None
+
+        return [[int(v) for v in r] for r in data["ranges"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _save_ranges(state_file: Path, size: int, ranges: list[list[int]]):
+    try:
+        state_file.write_text(json.dumps({"size": size, "ranges": ranges}))
+    except OSError:
+        pass
+
+
+_pool: cf.ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_write_lock = threading.Lock()
+
+
+def _segment_pool() -> cf.ThreadPoolExecutor:
+    """Long-lived threads, so each one keeps its `YDL` instance between files."""
+
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = cf.ThreadPoolExecutor(
+                max_workers=SEGMENT_WORKERS,
+                thread_name_prefix="media-dl-segment",
+            )
+
+        return _pool
+
+
+def _write(fd: int, data: bytes, offset: int):
+    view = memoryview(data)
+
+    while view:
+        if hasattr(os, "pwrite"):
+            written = os.pwrite(fd, view, offset)
+        else:
+            with _write_lock:
+                os.lseek(fd, offset, os.SEEK_SET)
+                written = os.write(fd, view)
+
+        view = view[written:]
+        offset += written
+
+
+def _check_range(url: str, headers: dict[str, str], size: int):
+    """Request the last byte, to know if ranges are honored before splitting."""
+
+    request = Request(url, headers=headers | {"Range": f"bytes={size - 1}-{size - 1}"})
+
+    try:
+        with shared_ydl() as ydl:
+            response = ydl.urlopen(request)
+
+            try:
+                content_range = response.headers.get("Content-Range", "")
+
+                if response.status != 206 or not content_range.endswith(f"/{size}"):
+                    raise RangeNotSupported(url)
+            finally:
+                response.close()
+    except RequestError as err:
+        raise RangeNotSupported(url) from err
@@ -1,4 +1,7 @@
 import logging
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 
 from yt_dlp.YoutubeDL import YoutubeDL
 
@@ -31,3 +34,59 @@ class YDL(YoutubeDL):
             opts,  # type: ignore
             auto_init,
         )
+
+
+_LOCAL = threading.local()
+_MISSING = object()
+
+
+@contextmanager
+def shared_ydl(params: YDLParams | None = None) -> Iterator[YDL]:
+    """Reuse the `YDL` instance of the current thread with temporal params.
+
+    Extractors, cookies and HTTP connection pools are kept between calls.
+    Params are restored on exit, so only the ones read on each operation
+    should be provided (not network or cookies options).
+    """
+
+    ydl: YDL | None = getattr(_LOCAL, "ydl", None)
+
+    # Nested usage, like from a progress hook.
+    if getattr(_LOCAL, "busy", False):
+        yield YDL(params, auto_init=True)
+        return
+
+    if ydl is None:
+        ydl = _LOCAL.ydl = YDL(auto_init=True)
+
+    overlay = dict(params or {})
+    hooks = overlay.pop("progress_hooks", [])
+    pp_hooks = overlay.pop("postprocessor_hooks", [])
+
+    if "outtmpl" in overlay:
+        outtmpl = overlay["outtmpl"]
+
+        if not isinstance(outtmpl, dict):
+            outtmpl = {"default": outtmpl}
+
+        overlay["outtmpl"] = ydl.params["outtmpl"] | outtmpl
+
+    saved = {key: ydl.params.get(key, _MISSING) for key in overlay}
+    saved_hooks = ydl._progress_hooks, ydl._postprocessor_hooks
+
+    ydl.params.update(overlay)  # type: ignore
+    ydl._progress_hooks = list(hooks)
+    ydl._postprocessor_hooks = list(pp_hooks)
+    _LOCAL.busy = True
+
+    try:
+        yield ydl
+    finally:
+        for key, value in saved.items():
+            if value is _MISSING:
+                ydl.params.pop(key, None)
+            else:
+                ydl.params[key] = value
+
+        ydl._progress_hooks, ydl._postprocessor_hooks = saved_hooks
+        _LOCAL.busy = False
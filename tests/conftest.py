@@ -0,0 +1,53 @@
+from collections.abc import Callable
+
+import pytest
+
+from media_dl import Media
+
+FORMATS = {
+    "audio": {
+        "format_id": "audio",
+        "url": "https://cdn.example.com/audio",
+        "protocol": "https",
+        "ext": "m4a",
+        "acodec": "mp4a.40.2",
+        "vcodec": "none",
+    },
+    "video": {
+        "format_id": "video",
+        "url": "https://cdn.example.com/video",
+        "protocol": "https",
+        "ext": "mp4",
+        "acodec": "none",
+        "vcodec": "avc1",
+        "width": 16,
+        "height": 9,
+    },
+}
+
+
+@pytest.fixture
+def make_media() -> Callable[..., Media]:
+    """Build an offline `Media`.
+
+    Formats are names of `FORMATS` or dicts which update the audio format.
+    Keyword arguments are fields of the media.
+    """
+
+    def _make(*formats: str | dict, **fields) -> Media:
+        id = fields.pop("id", "1")
+
+        return Media.model_validate(
+            {
+                "extractor_key": "Generic",
+                "url": f"https://example.com/{id}",
+                "id": id,
+                **fields,
+                "formats": [
+                    FORMATS[f] if isinstance(f, str) else FORMATS["audio"] | f
+                    for f in formats or ("audio",)
+                ],
+            }
+        )
+
+    return _make
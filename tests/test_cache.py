@@ -0,0 +1,138 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from media_dl.cache import CacheBackend, FileCache, MemoryCache, SQLiteCache
+
+
+@pytest.fixture(params=["sqlite", "file"])
+def backend(request, tmp_path: Path) -> CacheBackend:
+    if request.param == "sqlite":
+        return SQLiteCache(tmp_path / "cache.db", max_entries=2)
+    else:
+        return FileCache(tmp_path, max_entries=2)
+
+
+def test_save_load(backend: CacheBackend):
+    backend.save("https://example.com/1", '{"id": "1"}')
+    assert backend.load("https://example.com/1") == '{"id": "1"}'
+    assert backend.load("https://example.com/2") is None
+
+
+def test_expiration(backend: CacheBackend):
+    backend.expiration = 0
+    backend.save("https://example.com/1", "{}")
+
+    assert backend.load("https://example.com/1") is None
+    assert backend.stats().expired <= 1
+
+
+def test_prune(backend: CacheBackend):
+    for i in range(3):
+        backend.save(f"https://example.com/{i}", "{}")
+
+    backend.prune()
+    assert backend.stats().entries == 2
+
+    backend.prune(all=True)
+    assert backend.stats().entries == 0
+
+
+def test_lru(backend: CacheBackend):
+    for key in ("a", "b"):
+        backend.save(key, key)
+        time.sleep(0.01)
+
+    backend.load("a")
+    time.sleep(0.01)
+    backend.save("c", "c")
+
+    assert backend.stats().entries == 2
+    assert backend.load("a") == "a"
+    assert backend.load("b") is None
+
+
+def test_memory_cache():
+    cache = MemoryCache[str](maxsize=2)
+
+    assert cache.get("a") is None
+
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+
+    cache.put("c", "3")
+    assert cache.get("b") is None
+
+    stats = cache.stats()
+    assert (stats.entries, stats.hits, stats.misses) == (2, 1, 2)
+
+
+def test_cache_json(make_media, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from media_dl.cache import MODELS
+    from media_dl.models.content.base import _load_cache, _save_cache
+    from media_dl.models.content.media import Media
+
+    media = make_media(
+        {"format_id": "251", "ext": "opus", "acodec": "opus"},
+        {"format_id": "140", "ext": "mp4", "width": 0, "height": 0},
+        extractor_key="Youtube",
+        title="Song",
+        timestamp=1700000000,
+        chapters=[{"start_time": 0, "end_time": 5, "title": "Intro"}],
+    )
+
+    cached = Media.from_cache_json(media.to_cache_json())
+    assert "formats" not in cached.__dict__
+    assert cached.title == "Song"
+    assert [f.id for f in cached.formats] == [f.id for f in media.formats]
+    assert cached == media
+    assert cached.to_ydl_json() == media.to_ydl_json()
+
+    # Entries from previous versions are still loaded.
+    backend = FileCache(tmp_path)
+    monkeypatch.setattr("media_dl.cache._backend", backend)
+    backend.save(media.url, media.to_ydl_json())
+    MODELS.clear()
+    assert _load_cache(Media, media.url) == media
+
+    _save_cache(media, media.url)
+    assert backend.load(media.url) == media.to_cache_json()
+
+
+def test_cache_json_invalid(
+    make_media, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    import json
+
+    from media_dl.cache import MODELS
+    from media_dl.downloader.config import FormatConfig
+    from media_dl.downloader.pipeline import DownloadPipeline
+    from media_dl.models.content.media import LazyMedia, Media
+
+    class Extended(Media):
+        note: str = ""
+
+    # Fields only declared by the model itself are kept.
+    extended = Extended.model_validate(make_media().to_ydl_dict() | {"note": "a"})
+    assert Extended.from_cache_json(extended.to_cache_json()).note == "a"
+
+    media = make_media()
+    data = json.loads(media.to_cache_json()) | {"formats": "corrupt"}
+
+    backend = FileCache(tmp_path)
+    backend.save(media.url, json.dumps(data))
+    monkeypatch.setattr("media_dl.cache._backend", backend)
+    monkeypatch.setattr(
+        "media_dl.models.content.base.extract_url", lambda url: media.to_ydl_dict()
+    )
+    MODELS.clear()
+
+    # Corrupt entry is extracted again instead of failing the download.
+    lazy = LazyMedia(extractor_key="Generic", url=media.url, id=media.id)
+    pipeline = DownloadPipeline(FormatConfig(format="audio", output=tmp_path), lazy)
+    resolved, _ = pipeline.resolve_media()
+
+    assert resolved.formats[0].id == "audio"
+    assert Media.from_cache_json(backend.load(media.url) or "").formats
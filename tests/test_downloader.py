@@ -1,8 +1,39 @@
+import asyncio
+import concurrent.futures as cf
+import threading
+import time
+from pathlib import Path
 from tempfile import TemporaryDirectory
 
 import pytest
 
-from media_dl import Media, MediaDownloader, Playlist
+from media_dl import (
+    AsyncMediaDownloader,
+    DownloadError,
+    LazyMedia,
+    LazyPlaylist,
+    Media,
+    MediaDownloader,
+    Playlist,
+    RetryPolicy,
+)
+from media_dl.downloader.archive import DownloadArchive
+from media_dl.downloader.bus import ProgressBus
+from media_dl.downloader.index import OutputIndex
+from media_dl.downloader.journal import DownloadJournal
+from media_dl.downloader.limits import HostLimiter, RateLimiter
+from media_dl.downloader.main import QUEUE_FACTOR
+from media_dl.downloader.pipeline import DownloadPipeline, PipelinePlan
+from media_dl.downloader.states.progress import ProgressCallback
+from media_dl.exceptions import OutputTemplateError
+from media_dl.metrics import Metrics, otel_hook
+from media_dl.models.progress.base import State
+from media_dl.models.progress.media import (
+    DownloadingState,
+    ErrorState,
+    ResolvingState,
+    state_adapter,
+)
 
 TEMPDIR = TemporaryDirectory()
 
@@ -59,3 +90,769 @@ class TestSite:
 
     def test_soundcloud_playlist(self):
         download("https://soundcloud.com/playlist/sets/sound-of-berlin-01-qs1-x-synth")
+
+
+def test_staged_submission(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_download(self, plan):
+        nonlocal running, peak
+
+        with lock:
+            running += 1
+            peak = max(peak, running)
+
+        time.sleep(0.01)
+
+        with lock:
+            running -= 1
+
+        return plan
+
+    monkeypatch.setattr(DownloadPipeline, "stage_resolve", lambda self: self.id)
+    monkeypatch.setattr(DownloadPipeline, "stage_download", fake_download)
+    monkeypatch.setattr(DownloadPipeline, "stage_process", lambda self, p: Path(p))
+
+    medias = (
+        LazyMedia(extractor_key="Generic", url=f"https://example.com/{i}", id=str(i))
+        for i in range(50)
+    )
+    downloader = MediaDownloader(threads=4, download_workers=2, output=tmp_path)
+    paths = downloader.download_all(medias, None)
+
+    assert len(paths) == 50
+    assert peak <= 2
+
+
+def test_transfer_threads(make_media, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    from media_dl.models.format.types import Format
+    from media_dl.ydl import wrapper
+
+    created = []
+    # Video and audio of a media are downloaded together.
+    barrier = threading.Barrier(2, timeout=5)
+
+    class FakeYDL:
+        def __init__(self, params=None, auto_init=False):
+            created.append(threading.current_thread().name)
+            self.params = {"outtmpl": {}}
+            self._progress_hooks = self._postprocessor_hooks = []
+
+    def fake_download(self: Format, filepath: Path, *args, **kwargs):
+        with wrapper.shared_ydl():
+            barrier.wait()
+            path = tmp_path / f"{Path(filepath).name}.{self.extension}"
+            path.touch()
+            return path
+
+    def fake_resolve(self: DownloadPipeline):
+        media = make_media("video", "audio", id=self.id)
+        return PipelinePlan(
+            media=media,
+            output=tmp_path,
+            video_format=media.formats.only_video()[0],
+            audio_format=media.formats.only_audio()[0],
+        )
+
+    monkeypatch.setattr(wrapper, "YDL", FakeYDL)
+    monkeypatch.setattr(Format, "download", fake_download)
+    monkeypatch.setattr(DownloadPipeline, "stage_resolve", fake_resolve)
+    monkeypatch.setattr(DownloadPipeline, "stage_process", lambda s, p: p.video_file)
+
+    medias = [
+        LazyMedia(extractor_key="Generic", url=f"https://example.com/{i}", id=str(i))
+        for i in range(2)
+    ]
+    downloader = MediaDownloader(output=tmp_path, download_workers=1, resume=False)
+
+    assert len(downloader.download_all(medias, None)) == 2
+    # Video and audio threads are reused by the second media.
+    assert len(created) == 2
+    assert all(name.startswith("media-dl-transfer") for name in created)
+
+
+def test_download_formats(make_media, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    from media_dl.models.format.types import Format
+    from media_dl.models.progress.format import FormatState
+
+    media = make_media("video", "audio")
+    video, audio = media.formats.only_video()[0], media.formats.only_audio()[0]
+    barrier = threading.Barrier(2, timeout=5)
+    started = []
+    stopped = threading.Event()
+
+    def fake_download(self: Format, filepath, on_progress, *args, **kwargs):
+        started.append(self.id)
+        barrier.wait()
+
+        if self.id == "audio":
+            raise DownloadError("Connection reset")
+
+        try:
+            for i in range(500):
+                on_progress(FormatState(id=self.id, downloaded_bytes=i))
+                time.sleep(0.01)
+        except DownloadError:
+            stopped.set()
+            raise
+
+        return tmp_path / self.id
+
+    monkeypatch.setattr(Format, "download", fake_download)
+    downloader = MediaDownloader(output=tmp_path)
+
+    # Both formats are transferred together, the audio failure stops the video.
+    with pytest.raises(DownloadError, match="Connection reset"):
+        downloader._pipeline(media).download_formats(video, audio)
+
+    assert sorted(started) == ["audio", "video"]
+    assert stopped.is_set()
+
+    # A sibling still queued in a busy shared pool never starts.
+    def fail_download(self: Format, *args, **kwargs):
+        started.append(self.id)
+        raise DownloadError("Connection reset")
+
+    monkeypatch.setattr(Format, "download", fail_download)
+    started.clear()
+
+    with cf.ThreadPoolExecutor(max_workers=1) as transfers:
+        pipeline = downloader._pipeline(media, transfers=transfers)
+
+        with pytest.raises(DownloadError, match="Connection reset"):
+            pipeline.download_formats(video, audio)
+
+    assert started == ["video"]
+
+
+def test_journal_resume(tmp_path: Path):
+    media = LazyMedia(extractor_key="Generic", url="https://example.com/1", id="1")
+    journal = DownloadJournal(tmp_path)
+
+    journal.update(media, "resolved", formats=["video", "audio"])
+    journal.part_file(media, "video").with_suffix(".part").touch()
+    journal.update(media, "completed", filepath=str(tmp_path / "file.mp4"))
+
+    entry = DownloadJournal(tmp_path).get(media)
+    assert entry and entry.state == "completed"
+    assert entry.formats == ["video", "audio"]
+
+    journal.clear_parts(media)
+    assert not any(journal.parts_dir.iterdir())
+
+
+def test_journal_profile(make_media, tmp_path: Path):
+    media = make_media("audio", "video")
+    video = MediaDownloader("video", output=tmp_path, resume=True)
+    audio = MediaDownloader("audio", output=tmp_path, resume=True)
+    journal = audio._journal = video.journal
+    assert journal and journal.directory.parent == tmp_path
+
+    filepath = tmp_path / "file.mp4"
+    filepath.touch()
+    journal.update(
+        media,
+        "completed",
+        profile=video.config.profile,
+        formats=["video", "audio"],
+        filepath=str(filepath),
+    )
+
+    assert video._pipeline(media).check_journal() == filepath
+    assert audio._pipeline(media).check_journal() is None
+
+    # Interrupted video download isn't resumed as audio.
+    journal.update(media, "downloading")
+    journal.part_file(media, "video").touch()
+
+    assert video._pipeline(media).select_formats(media)[0].id == "video"  # type: ignore
+    assert audio._pipeline(media).select_formats(media)[1].id == "audio"  # type: ignore
+    assert journal.get(media) is None
+    assert not any(journal.parts_dir.iterdir())
+    assert DownloadJournal(tmp_path).get(media) is None
+
+    # Journal is opt-in, and a single one is created for all threads.
+    assert MediaDownloader(output=tmp_path)._pipeline(media).journal is None
+    assert not (tmp_path / "new").exists()
+
+    downloader = MediaDownloader(output=tmp_path / "new" / "{title}", resume=True)
+
+    with cf.ThreadPoolExecutor(8) as executor:
+        journals = set(executor.map(lambda _: id(downloader.journal), range(8)))
+
+    assert len(journals) == 1
+    assert downloader.journal
+    assert downloader.journal.directory.parent == tmp_path / "new"
+
+
+def test_process_chapters(make_media, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    from media_dl.processor import ProcessorPlan
+
+    media = make_media(chapters=[{"start_time": 0, "end_time": 5, "title": "Intro"}])
+    chapters = []
+
+    def fake_run(self: ProcessorPlan, ffmpeg):
+        chapters.extend(self.chapters)
+        return self
+
+    monkeypatch.setattr(ProcessorPlan, "run", fake_run)
+    monkeypatch.setattr(DownloadPipeline, "process_tags", lambda *_: pytest.fail())
+
+    downloader = MediaDownloader("audio", output=tmp_path, resume=False)
+    downloader.config.ffmpeg_path = tmp_path / "ffmpeg"
+
+    pipeline = downloader._pipeline(media)
+    plan = PipelinePlan(
+        media=media,
+        output=tmp_path,
+        audio_format=media.formats[0],  # type: ignore
+        audio_file=tmp_path / "audio.m4a",
+    )
+
+    pipeline.process(plan)
+    assert [c.title for c in chapters] == ["Intro"]
+
+
+def test_output_index(tmp_path: Path):
+    (tmp_path / "Artist - Song.mp3").touch()
+    (tmp_path / "Artist - Song.jpg").touch()
+
+    index = OutputIndex(persist=True)
+    assert index.extensions(tmp_path / "Artist - Song") == {"mp3", "jpg"}
+    assert index.extensions(tmp_path / "missing" / "Song") == set()
+
+    index.add(tmp_path / "Artist - Video.mp4")
+    index.save()
+
+    assert OutputIndex(persist=True).extensions(tmp_path / "Artist - Video") == {"mp4"}
+
+
+def test_archive(tmp_path: Path):
+    filepath = tmp_path / "archive.txt"
+    filepath.write_text("youtube abc\n")
+
+    media = LazyMedia(extractor_key="Generic", url="https://example.com/1", id="1")
+    archive = DownloadArchive(filepath)
+
+    assert media not in archive
+    archive.add(media, tmp_path / "file.mp4")
+
+    archive = DownloadArchive(filepath)
+    assert media in archive and len(archive) == 2
+    assert archive.get(media) == tmp_path / "file.mp4"
+
+    # Archived by YT-DLP, the file is unknown.
+    states = []
+    downloader = MediaDownloader(output=tmp_path, archive=filepath)
+    other = LazyMedia(extractor_key="Youtube", url="https://youtu.be/abc", id="abc")
+
+    assert downloader.download(other, states.append) is None
+    assert states[-1].status == "skipped" and states[-1].filepath is None
+
+
+def test_async_download_all(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    def fake_resolve(self: DownloadPipeline):
+        self.progress(ResolvingState(id=self.id, media=self.media))
+        return tmp_path / self.id
+
+    monkeypatch.setattr(DownloadPipeline, "stage_resolve", fake_resolve)
+
+    medias = [
+        LazyMedia(extractor_key="Generic", url=f"https://example.com/{i}", id=str(i))
+        for i in range(20)
+    ]
+
+    async def main():
+        async with AsyncMediaDownloader(threads=2, output=tmp_path) as downloader:
+            paths = await downloader.download_all(medias)
+            events = [event async for event in downloader.events(medias)]
+            return paths, events
+
+    paths, events = asyncio.run(main())
+
+    assert sorted(paths) == sorted(tmp_path / m.id for m in medias)
+    assert len(events) == 20
+
+
+def test_download_bounded(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    consumed = 0
+    started = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_resolve(self: DownloadPipeline):
+        nonlocal started, peak
+
+        with lock:
+            started += 1
+            # Pulled from the generator but not started yet.
+            peak = max(peak, consumed - started)
+
+        time.sleep(0.002)
+        return tmp_path / self.id
+
+    monkeypatch.setattr(DownloadPipeline, "stage_resolve", fake_resolve)
+
+    def medias():
+        nonlocal consumed
+
+        for i in range(100):
+            with lock:
+                consumed += 1
+
+            yield LazyMedia(
+                extractor_key="Generic", url=f"https://example.com/{i}", id=str(i)
+            )
+
+    downloader = MediaDownloader(threads=1, output=tmp_path)
+    paths = downloader.download_all(medias(), None)
+
+    assert len(paths) == 100
+    assert 0 < peak <= sum(downloader.workers.values()) * QUEUE_FACTOR
+
+
+def test_async_download_bounded(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    consumed = 0
+    done = 0
+    peak = 0
+    attempts: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def fake_resolve(self: DownloadPipeline):
+        nonlocal done, peak
+
+        with lock:
+            peak = max(peak, consumed - done)
+            done += 1
+            attempts[self.id] = attempts.get(self.id, 0) + 1
+
+        if self.id == "3" and attempts[self.id] == 1:
+            raise DownloadError("Connection reset", retryable=True)
+
+        return tmp_path / self.id
+
+    monkeypatch.setattr(DownloadPipeline, "stage_resolve", fake_resolve)
+
+    def medias():
+        nonlocal consumed
+
+        for i in range(200):
+            consumed += 1
+            yield LazyMedia(
+                extractor_key="Generic", url=f"https://example.com/{i}", id=str(i)
+            )
+
+    async def main():
+        async with AsyncMediaDownloader(threads=1, output=tmp_path) as downloader:
+            return await downloader.download_all(medias())
+
+    paths = asyncio.run(main())
+    limit = 3 * QUEUE_FACTOR
+
+    # Consumers plus the queue, never the whole generator.
+    assert peak <= limit * 2 + 1
+    # Transient failure retried in the final pass.
+    assert attempts["3"] == 2
+    assert len(paths) == 200
+
+
+def test_download_stream(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    consumed = 0
+    started_at = []
+
+    def entries():
+        nonlocal consumed
+
+        for i in range(50):
+            consumed += 1
+            yield {
+                "_type": "url",
+                "ie_key": "Generic",
+                "url": f"https://example.com/{i}",
+                "id": str(i),
+            }
+
+    def fake_resolve(self: DownloadPipeline):
+        started_at.append(consumed)
+        return tmp_path / self.id
+
+    monkeypatch.setattr(DownloadPipeline, "stage_resolve", fake_resolve)
+
+    playlist = LazyPlaylist(
+        extractor_key="Generic", url="https://example.com/p", id="p"
+    )
+    playlist._entries = entries()
+    downloader = MediaDownloader(threads=1, output=tmp_path, use_cache=False)
+
+    paths = downloader.download_stream(playlist, None)
+
+    assert sorted(paths) == sorted(tmp_path / str(i) for i in range(50))
+    # Downloads started before the playlist was fully extracted.
+    assert started_at[0] < 50
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(1000)
+    start = time.monotonic()
+
+    # First second is allowed as burst.
+    limiter.consume(1000)
+    limiter.consume(200)
+
+    assert 0.15 <= time.monotonic() - start < 0.5
+
+
+def test_host_limiter():
+    limiter = HostLimiter(1)
+    running = {"cdn.example.com": 0}
+    peak = 0
+    lock = threading.Lock()
+
+    def transfer(url: str):
+        nonlocal peak
+
+        with limiter.acquire(url):
+            with lock:
+                running["cdn.example.com"] += 1
+                peak = max(peak, running["cdn.example.com"])
+
+            time.sleep(0.01)
+
+            with lock:
+                running["cdn.example.com"] -= 1
+
+    threads = [
+        threading.Thread(target=transfer, args=(f"https://cdn.example.com/{i}",))
+        for i in range(4)
+    ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 1
+
+    # Segmented downloads only open the free connections.
+    limiter = HostLimiter(3)
+
+    with limiter.acquire("https://cdn.example.com/1") as connections:
+        assert connections == 1
+
+        with limiter.acquire("https://cdn.example.com/2", 8) as connections:
+            assert connections == 2
+
+    with limiter.acquire("https://cdn.example.com/3", 8) as connections:
+        assert connections == 3
+
+
+def test_progress_bus():
+    received = []
+    bus = ProgressBus(rate=100)
+    bus.subscribe(received.append)
+    unsubscribe = bus.subscribe(lambda s: 1 / 0)
+    unsubscribe()
+
+    with bus:
+        media = LazyMedia(extractor_key="Generic", url="https://example.com/1", id="1")
+        downloading = DownloadingState(id="1")
+
+        bus.publish(ResolvingState(id="1", media=media))
+
+        for i in range(1000):
+            downloading.downloaded_bytes = i
+            bus.publish(downloading)
+
+        bus.publish(ErrorState(id="1", message="Failed."))
+
+    assert [s.status for s in received[:2]] == ["resolving", "downloading"]
+    assert len(received) < 100
+    assert received[-2].downloaded_bytes == 999
+    assert received[-1].status == "error"
+
+
+def test_progress_state_json():
+    adapter = state_adapter()
+    state = DownloadingState(id="1", downloaded_bytes=10, total_bytes=20)
+    assert isinstance(state, State)
+
+    data = adapter.dump_json(state, by_alias=True)
+    assert adapter.validate_json(data) == state
+
+
+def test_progress_linger(monkeypatch: pytest.MonkeyPatch):
+    media = LazyMedia(extractor_key="Generic", url="https://example.com/1", id="1")
+    monkeypatch.setattr(time, "sleep", lambda _: pytest.fail("Worker slept."))
+
+    for linger in (True, False):
+        progress = ProgressCallback(disable=True, linger=linger)
+        progress(ResolvingState(id="1", media=media))
+        progress(ErrorState(id="1", message="Failed."))
+
+        assert len(progress.tasks) == int(linger)
+
+        # Renderer removes the row once expired.
+        progress._expiring = dict.fromkeys(progress._expiring, 0)
+        progress.get_renderable()
+
+        assert not progress.tasks
+
+
+def test_retry(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    # Failures before success: none, recovered by item retry, by final pass.
+    failures = {"0": 0, "1": 1, "2": 2}
+    calls = dict.fromkeys(failures, 0)
+
+    def flaky_download(self: DownloadPipeline, *formats):
+        calls[self.id] += 1
+
+        if calls[self.id] <= failures[self.id]:
+            raise DownloadError("Read timed out.", retryable=True)
+        return tmp_path / self.id, None
+
+    def fake_resolve(self: DownloadPipeline):
+        return PipelinePlan(media=self.media, output=tmp_path)  # type: ignore
+
+    monkeypatch.setattr(DownloadPipeline, "stage_resolve", fake_resolve)
+    monkeypatch.setattr(DownloadPipeline, "download_formats", flaky_download)
+    monkeypatch.setattr(DownloadPipeline, "stage_process", lambda s, p: p.video_file)
+
+    medias = [
+        LazyMedia(extractor_key="Generic", url=f"https://example.com/{id}", id=id)
+        for id in failures
+    ]
+    policy = RetryPolicy(attempts=2, backoff=0)
+    downloader = MediaDownloader(output=tmp_path, retry=policy, resume=False)
+    paths = downloader.download_all(medias, None)
+
+    assert sorted(paths) == [tmp_path / id for id in failures]
+    assert calls == {"0": 1, "1": 2, "2": 3}
+
+
+def test_concurrent_fragments(monkeypatch: pytest.MonkeyPatch):
+    from media_dl.ydl import downloader
+
+    params = {}
+    monkeypatch.setattr(
+        downloader, "download_from_info", lambda info, p: params.update(p)
+    )
+    downloader.download_format("file", {"format_id": "hls"}, concurrent_fragments=4)  # type: ignore
+
+    assert params["concurrent_fragment_downloads"] == 4
+    assert downloader.is_fragmented({"protocol": "m3u8_native"})  # type: ignore
+    assert not downloader.is_fragmented({"protocol": "https"})  # type: ignore
+
+
+def test_fragments_host_limit(
+    make_media, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    from media_dl.models.format.types import Format
+
+    fragments = []
+
+    def fake_download(self: Format, filepath: Path, *args, **kwargs):
+        fragments.append(kwargs["concurrent_fragments"])
+        path = tmp_path / f"{Path(filepath).name}.{self.extension}"
+        path.touch()
+        return path
+
+    monkeypatch.setattr(Format, "download", fake_download)
+
+    media = make_media({"protocol": "m3u8_native"})
+    downloader = MediaDownloader(
+        "audio", output=tmp_path, concurrent_fragments=4, host_connections=3
+    )
+    downloader._pipeline(media).download_formats(audio_fmt=media.formats[0])  # type: ignore
+
+    # Every fragment takes a connection of the host.
+    assert fragments == [3]
+
+
+@pytest.fixture
+def range_server():
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    data = bytes(range(256)) * 64 * 1024  # 16 MiB
+    # Bytes sent, and ranged responses to cut in half.
+    stats = {"served": 0, "fail": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            start, end = 0, len(data) - 1
+            body_end = end
+
+            if ranges := self.headers.get("Range"):
+                start, end = (int(v) for v in ranges[6:].split("-"))
+                body_end = end
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+
+                with lock:
+                    if end > start and stats["fail"]:
+                        stats["fail"] -= 1
+                        body_end = start + (end - start) // 2
+            else:
+                self.send_response(200)
+
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+            self.wfile.write(data[start : body_end + 1])
+
+            with lock:
+                stats["served"] += body_end - start + 1
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield f"http://127.0.0.1:{server.server_port}/file", data, stats
+    server.shutdown()
+
+
+def test_segmented_download(range_server, tmp_path: Path):
+    from media_dl.ydl.segmented import download_segmented, supports_segments
+
+    url, data, stats = range_server
+    info = {"url": url, "ext": "mp4", "protocol": "http", "filesize": len(data)}
+    progress = []
+
+    assert supports_segments(info, 4)  # type: ignore
+    path = download_segmented(tmp_path / "file", info, 4, progress.append)  # type: ignore
+
+    assert path.read_bytes() == data
+    assert progress[-1] == {"status": "finished"}
+
+    # Completed file isn't downloaded again.
+    served = stats["served"]
+    download_segmented(tmp_path / "file", info, 4)  # type: ignore
+    assert stats["served"] == served
+
+    # Failed ranges are retried.
+    stats["fail"] = 2
+    retry = RetryPolicy(fragment_retries=2, backoff=0)
+    path = download_segmented(tmp_path / "retry", info, 4, retry=retry)  # type: ignore
+    assert path.read_bytes() == data
+
+    # Without retries, next try continues the written ranges.
+    stats["fail"], stats["served"] = 4, 0
+
+    with pytest.raises(DownloadError):
+        download_segmented(tmp_path / "resume", info, 4)  # type: ignore
+
+    stats["served"] = 0
+    path = download_segmented(tmp_path / "resume", info, 4)  # type: ignore
+
+    assert path.read_bytes() == data
+    assert stats["served"] < len(data)
+    assert not list(tmp_path.glob("*.ranges"))
+
+
+def test_output_template(make_media):
+    from media_dl.template.parser import OutputTemplate, generate_output_template
+
+    media = make_media(
+        {"format_id": "251", "ext": "opus", "acodec": "opus"},
+        extractor_key="Youtube",
+        title="Song",
+        uploader="Artist - Topic",
+    )
+    template = OutputTemplate("{uploader} - {title} [{audio_codec}]")
+
+    assert template.keys == {"uploader", "title", "audio_codec"}
+    assert template.generate(media, format=media.formats[0]) == Path(
+        "Artist - Song [opus]"
+    )
+    assert generate_output_template("{title}", media) == Path("Song")
+
+    with pytest.raises(OutputTemplateError):
+        OutputTemplate("{unknown}")
+    with pytest.raises(OutputTemplateError):
+        OutputTemplate("{title")
+
+
+def test_format_list():
+    from media_dl.models.format.codecs import get_codec_rank
+    from media_dl.models.format.list import FormatList
+
+    formats = FormatList.model_validate(
+        [
+            {
+                "format_id": str(abr),
+                "url": f"https://cdn.example.com/{abr}",
+                "protocol": "https",
+                "ext": "m4a",
+                "acodec": "mp4a.40.2",
+                "vcodec": "none",
+                "tbr": abr,
+            }
+            for abr in (48, 128, 256)
+        ]
+    ).sort_by("best")
+
+    assert formats.only_audio() is formats.only_audio()
+    assert formats.filter(extension="m4a") is formats.filter(extension="m4a")
+    assert [f.id for f in formats] == ["256", "128", "48"]
+    assert formats[0].rank is formats.sort_by("best")[0].rank
+    assert not formats.only_video()
+    assert formats.get_closest_quality(160).id == "128"
+    assert formats.get_by_id("256").quality == 256
+    assert get_codec_rank("MP4A.40.2", "audio") == 8
+
+
+def test_metrics(make_media, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    spans = []
+
+    class Span:
+        def __init__(self, name, start_time, attributes):
+            self.name, self.start, self.attributes = name, start_time, attributes
+
+        def set_attribute(self, key, value):
+            self.attributes[key] = value
+
+        def end(self, end_time):
+            spans.append(self)
+
+    class Tracer:
+        def start_span(self, name, start_time, attributes):
+            return Span(name, start_time, attributes)
+
+    metrics = Metrics()
+    metrics.subscribe(otel_hook(Tracer()))
+
+    with metrics.span("download_format", "1", format="251") as event:
+        event.bytes = 1024
+
+    with pytest.raises(DownloadError), metrics.span("resolve", "2"):
+        raise DownloadError("Failed.")
+
+    metrics.count("retries")
+
+    assert metrics.stages["download_format"].bytes == 1024
+    assert metrics.stages["resolve"].errors == 1
+    assert [s.attributes.get("error.type") for s in spans] == [None, "DownloadError"]
+    assert spans[0].attributes["media.format"] == "251"
+
+    text = metrics.to_prometheus()
+    assert 'media_dl_stage_seconds_count{stage="resolve"} 1' in text
+    assert 'media_dl_stage_bytes_total{stage="download_format"} 1024' in text
+    assert "media_dl_retries_total 1" in text
+    assert "resolve" in metrics.summary()
+
+    # Pipelines report their stages.
+    def fake_select(self, media):
+        return None, None
+
+    monkeypatch.setattr(DownloadPipeline, "select_formats", fake_select)
+    monkeypatch.setattr(DownloadPipeline, "check_output_duplicate", lambda s, o: o)
+
+    metrics.reset()
+    media = make_media()
+    downloader = MediaDownloader(output=tmp_path, resume=False, metrics=metrics)
+    downloader.download(media, None)
+
+    assert set(metrics.stages) == {"resolve", "select_formats", "check_duplicate"}
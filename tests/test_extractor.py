@@ -1,9 +1,14 @@
+import itertools
+
 import pytest
 from rich import print
 
-from media_dl import Media, Playlist, Search
+from media_dl import LazyMedia, LazyPlaylist, Media, Playlist, Search
 from media_dl.exceptions import ExtractError
+from media_dl.models.content.list import MediaList
 from media_dl.ydl.extractor import SEARCH_SERVICE
+from media_dl.ydl.messages import is_retryable
+from media_dl.ydl.wrapper import shared_ydl
 
 
 def extract_url(url: str) -> Media | Playlist:
@@ -105,3 +110,127 @@ class TestSite:
 
     def test_soundcloud(self):
         extract_url("https://api.soundcloud.com/tracks/1269676381")
+
+
+def test_shared_ydl():
+    def hook(_):
+        pass
+
+    with shared_ydl({"outtmpl": "file.%(ext)s", "progress_hooks": [hook]}) as ydl:
+        assert ydl.params["outtmpl"]["default"] == "file.%(ext)s"
+        assert ydl._progress_hooks == [hook]
+
+        with shared_ydl() as nested:
+            assert nested is not ydl
+
+    with shared_ydl() as reused:
+        assert reused is ydl
+        assert reused.params["outtmpl"]["default"] != "file.%(ext)s"
+        assert reused._progress_hooks == []
+
+
+def test_resolve_all(monkeypatch: pytest.MonkeyPatch):
+    calls = []
+
+    def fake_from_url(cls, url: str, use_cache: bool = True):
+        calls.append(url)
+
+        if url.endswith("error"):
+            raise ExtractError("Unavailable")
+        return cls.model_construct(extractor="Generic", url=url, id=url[-1])
+
+    monkeypatch.setattr(Media, "from_url", classmethod(fake_from_url))
+
+    medias = [
+        LazyMedia(extractor_key="Generic", url=f"https://example.com/{id}", id=id)
+        for id in ("1", "2", "1", "error")
+    ]
+    playlist = MediaList(medias=medias, playlists=[])
+    result = playlist.prefetch(concurrency=2)
+
+    assert sorted(calls) == sorted(m.url for m in medias[:2] + medias[3:])
+    assert [m.id for m in result.medias] == ["1", "2"]
+    assert list(result.errors) == ["https://example.com/error"]
+    assert [type(m) for m in playlist.medias] == [Media, Media, Media, LazyMedia]
+
+
+def test_iter_entries(monkeypatch: pytest.MonkeyPatch):
+    from media_dl.models.content import list as content_list
+
+    consumed = []
+    extracted = []
+
+    def entries(prefix: str, count: int):
+        for i in range(count):
+            consumed.append(f"{prefix}{i}")
+            yield {
+                "_type": "url",
+                "ie_key": "Generic",
+                "url": f"https://example.com/{prefix}{i}",
+                "id": f"{prefix}{i}",
+            }
+
+    def fake_extract(url: str):
+        extracted.append(url)
+        return {"entries": entries("b", 2)}
+
+    monkeypatch.setattr(content_list, "extract_url_lazy", fake_extract)
+    monkeypatch.setattr(content_list, "_load_cache", lambda cls, url: None)
+
+    playlist = LazyPlaylist(
+        extractor_key="Generic", url="https://example.com/p", id="p"
+    )
+    playlist._entries = itertools.chain(
+        entries("a", 1),
+        [
+            {
+                "_type": "url",
+                "ie_key": "YoutubeTab",
+                "url": "https://example.com/b",
+                "id": "b",
+            },
+            {"_type": "url", "ie_key": "YoutubeTab", "id": "invalid"},
+        ],
+        entries("c", 1),
+    )
+    stream = playlist.iter_entries()
+
+    # Entries are yielded while the source is consumed.
+    assert next(stream).id == "a0"
+    assert consumed == ["a0"]
+
+    # Nested playlists are extracted and expanded in place, invalid entries skipped.
+    assert [m.id for m in stream] == ["b0", "b1", "c0"]
+    assert extracted == ["https://example.com/b"]
+    assert consumed == ["a0", "b0", "b1", "c0"]
+
+    # Cached playlists are used without extracting.
+    cached = Playlist(
+        extractor_key="Generic",
+        url="https://example.com/p",
+        id="p",
+        medias=[LazyMedia(extractor_key="Generic", url="https://a.com/1", id="1")],
+        playlists=[
+            LazyPlaylist(extractor_key="Generic", url="https://example.com/c", id="c")
+        ],
+    )
+    monkeypatch.setattr(
+        content_list,
+        "_load_cache",
+        lambda cls, url: cached if url == cached.url else None,
+    )
+    extracted.clear()
+
+    playlist = LazyPlaylist(
+        extractor_key="Generic", url="https://example.com/p", id="p"
+    )
+    assert [m.id for m in playlist.iter_entries()] == ["1", "b0", "b1"]
+    assert extracted == ["https://example.com/c"]
+    assert [m.id for m in playlist.iter_entries(use_cache=False)] == ["b0", "b1"]
+
+
+def test_retryable_messages():
+    assert is_retryable(Exception("ERROR: HTTP Error 429: Too Many Requests"))
+    assert is_retryable(Exception("ERROR: Read timed out."))
+    assert not is_retryable(Exception("ERROR: HTTP Error 404: Not Found"))
+    assert not is_retryable(Exception("ERROR: Unsupported URL: https://a.com"))
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from mutagen.id3 import ID3
+
+from media_dl.models.content.metadata import Chapter
+from media_dl.processor import ProcessorPlan, _ffmetadata
+from media_dl.tagger import MediaTagger
+
+
+def test_plan_merge():
+    plan = ProcessorPlan(
+        Path("out.mp4"),
+        video=Path("video.webm"),
+        audio=Path("audio.m4a"),
+        subtitles=[Path("subs.en.vtt")],
+        thumbnail=Path("cover.webp"),
+    )
+    args = plan.args(Path("metadata.txt"))
+
+    assert args.count("-i") == 5
+    assert args[-1] == "out.mp4"
+    assert ["-c:s", "mov_text"] == args[args.index("-c:s") : args.index("-c:s") + 2]
+    assert "-disposition:v:1" in args
+    assert plan.operations == [
+        "merge_formats",
+        "embed_subtitles",
+        "embed_thumbnail",
+    ]
+
+
+def test_plan_audio():
+    plan = ProcessorPlan(Path("out.opus"), audio=Path("audio.opus"))
+    args = plan.args()
+
+    assert ["-map", "0:a:0"] == args[args.index("-map") : args.index("-map") + 2]
+    assert "attached_pic" not in args
+    assert plan.operations == ["remux"]
+
+
+def test_ffmetadata():
+    text = _ffmetadata(
+        {"title": "A=B; #1"},
+        [Chapter(start_time=0, end_time=10, title="Intro")],
+    )
+
+    assert r"title=A\=B\; \#1" in text
+    assert "END=10000" in text
+
+
+def test_tagger_mp3(tmp_path: Path):
+    # Minimal MPEG-1 Layer III stream
+    file = tmp_path / "audio.mp3"
+    file.write_bytes((b"\xff\xfb\x90\x64" + b"\x00" * 413) * 10)
+
+    cover = tmp_path / "cover.png"
+    cover.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 16)
+
+    MediaTagger(file).embed_metadata(
+        {"title": "Title", "artist": "Artist", "date": "20240101"}
+    ).embed_thumbnail(cover).save()
+
+    tags = ID3(file)
+    assert str(tags["TIT2"]) == "Title"
+    assert str(tags["TDRC"]) == "2024-01-01"
+    assert tags.getall("APIC")[0].mime == "image/png"